@@ -150,7 +150,7 @@ def calcRemainingPoints(b, columns, rows):
 			if b[x][y]:
 				if b[x][y] not in colors:
 					colors[b[x][y]] = 0
-				colors[b[x][y]] += 0
+				colors[b[x][y]] += 1
 
 	for c in colors:
 		score += calcScore(colors[c])
@@ -490,6 +490,6 @@ if __name__ == "__main__":
 	#quit()
 
 	if board:
-		now = time.clock()
+		now = time.perf_counter()
 		print(playGraphBasedNoDoubleBoards(board), file=sys.stderr)
-		print(time.clock()-now)
+		print(time.perf_counter()-now)
@@ -39,8 +39,8 @@ class Board():
 
 		self.numOfColors = len(self.colors)
 
-		# Save number of columns and rows
-		self.rows, self.columns = self.board.shape
+		# Save number of columns and rows (the array is indexed as [x][y])
+		self.columns, self.rows = self.board.shape
 
 		# Save original number of columns and rows. Mainly used for printing a nice board :)
 		self.origColumns = self.columns
@@ -78,79 +78,130 @@ class Board():
 		return '\n'.join(lines) + '\n'
 
 
+	def copy(self):
+		'''
+		Returns a copy of the board. Much cheaper than `copy.deepcopy`, as only the array, the color counts and the moves are copied.
+		'''
+
+		new = copy.copy(self)
+		new.board = self.board.copy()
+		new.colors = dict(self.colors)
+		new.moves = list(self.moves)
+
+		return new
+
+
 	def floodFill(self, x, y):
 		'''
-		Returns all elements that belong to a field starting with a given coordinate. Uses a iterative floodfill algorithm using a not-so-standard queue approach using a set.
+		Returns all elements that belong to a field starting with a given coordinate. The field is grown from the element by shifting a boolean mask into all four directions and masking it with the elements of the same color until it does not grow any more.
 		This method does NOT change the board!
 
 		:param x: The x-coordinate (column) of the element to start from
 		:param y: The y-coordinate (row) of the element to start from
-		:returns: A set of tuples with coordinates (x,y) that belong to the field
+		:returns: A boolean array of the size of the board that is True for the elements of the field
 		'''
 
-		color = self.board[x][y]
+		color = self.board[x, y]
+		area = np.zeros(self.board.shape, dtype=bool)
 		if not color:
-			return []
-		toChange = set()
-		toChange.add((x, y))
-		toFill = set()
-		toFill.add((x, y))
-		while toFill:
-			x, y = toFill.pop()
-
-			toChange.add((x, y))
-
-			if x > 0 and self.board[x-1][y] == color and (x-1, y) not in toChange:
-				toFill.add((x-1, y))
-
-			if x < self.columns - 1 and self.board[x+1][y] == color and (x+1, y) not in toChange:
-				toFill.add((x+1, y))
-
-			if y > 0 and self.board[x][y-1] == color and (x, y-1) not in toChange:
-				toFill.add((x, y-1))
-
-			if y < self.rows - 1 and self.board[x][y+1] == color and (x, y+1) not in toChange:
-				toFill.add((x, y+1))
-
-		return toChange
+			return area
+		same = self.board == color
+		area[x, y] = True
+		while True:
+			grown = area.copy()
+			grown[1:] |= area[:-1]
+			grown[:-1] |= area[1:]
+			grown[:, 1:] |= area[:, :-1]
+			grown[:, :-1] |= area[:, 1:]
+			grown &= same
+			if np.array_equal(grown, area):
+				return area
+			area = grown
+
+
+	def labelAreas(self):
+		'''
+		Labels all connected areas of the board at once. Every element starts with its own flat index (x * origRows + y) as label. Then each element takes the smallest label of its neighbours with the same color and the labels are followed like pointers (label = label[label]) until nothing changes any more.
+		Because the board is indexed as [x][y], the smallest index of an area is its first element in the order of `findAreas`.
 
+		:returns: A flat array with the label of each element and a flat boolean array that is True for all non-empty elements
+		'''
 
-	def findAreas(self):
+		board = self.board
+		columns, rows = board.shape
+		occupied = (board != 0).ravel()
+		labels = np.arange(columns * rows).reshape(columns, rows)
+
+		# Neighbours with the same color on the right and on top of each element
+		right = (board[:-1] == board[1:]) & (board[:-1] != 0)
+		top = (board[:, :-1] == board[:, 1:]) & (board[:, :-1] != 0)
+
+		while True:
+			new = labels.copy()
+			np.minimum(new[:-1], np.where(right, labels[1:], new[:-1]), out=new[:-1])
+			np.minimum(new[1:], np.where(right, labels[:-1], new[1:]), out=new[1:])
+			np.minimum(new[:, :-1], np.where(top, labels[:, 1:], new[:, :-1]), out=new[:, :-1])
+			np.minimum(new[:, 1:], np.where(top, labels[:, :-1], new[:, 1:]), out=new[:, 1:])
+			new = new.ravel()
+			while True:
+				jumped = new[new]
+				if np.array_equal(jumped, new):
+					break
+				new = jumped
+			new = new.reshape(columns, rows)
+			if np.array_equal(new, labels):
+				return labels.ravel(), occupied
+			labels = new
+
+
+	def findAreas(self, withCells=False):
 		'''
 		Finds all clickable areas with more than one element in the board.
+
+		:param withCells: If True, the areas are returned as `(x, y, size, cells)` with a boolean array of the elements as `cells` (like `floodFill`)
 		'''
 
-		inArea = set()
-		areaEntries = []
+		labels, occupied = self.labelAreas()
+		roots, sizes = np.unique(labels[occupied], return_counts=True)
+		clickable = sizes > 1
+		roots = roots[clickable]
+		sizes = sizes[clickable]
 
-		for x in range(self.columns):
-			for y in range(self.rows):
-				if self.board[x][y] and (x, y) not in inArea:
-					area = self.floodFill(x, y)
-					inArea.update(area)
-					if len(area) > 1:
-						areaEntries.append((x, y, len(area)))
+		areaEntries = []
+		for root, size in zip(roots.tolist(), sizes.tolist()):
+			x, y = divmod(root, self.origRows)
+			if withCells:
+				areaEntries.append((x, y, size, (labels == root).reshape(self.board.shape)))
+			else:
+				areaEntries.append((x, y, size))
 
 		return areaEntries
 
 
-	def click(self, x, y):
+	def click(self, x, y, toChange=None):
 		'''
 		Performs a "click" on a board element. If the element is 0 or it has no neighbours with the same number, nothing happens. If it has at least one neighbour with the same number, the whole field is removed, gravity applies, and the player is rewarded with points for removing the field. The number of colors is updated.
 		CHANGES THE BOARD IN PLACE!
 
 		:param x: The x-coordinate (column) of the click
 		:param y: The y-coordinate (row) of the click
+		:param toChange: Optional boolean array of the field (as returned by `floodFill`), or the coordinates (x,y) of its elements (as returned by the `findAreas` of the other implementations)
 		'''
 
-		if self.board[x][y]:
-			toChange = self.floodFill(x, y)
-			if len(toChange) > 1:
-				self.colors[self.board[x][y]] -= len(toChange)
-				for x, y in toChange:
-					self.board[x][y] = 0
+		color = int(self.board[x, y])
+		if color:
+			if toChange is None:
+				toChange = self.floodFill(x, y)
+			elif not isinstance(toChange, np.ndarray):
+				cells = np.array(list(toChange)).reshape(-1, 2)
+				toChange = np.zeros(self.board.shape, dtype=bool)
+				toChange[cells[:, 0], cells[:, 1]] = True
+			n = int(np.count_nonzero(toChange))
+			if n > 1:
+				self.colors[color] -= n
+				self.board[toChange] = 0
 				self.applyGravity()
-				self.score += self.calcScore(len(toChange))
+				self.score += self.calcScore(n)
 				self.moves.append((x, y))
 
 
@@ -185,34 +236,19 @@ class Board():
 
 	def applyGravity(self):
 		'''
-		Applies gravity to the board elements and removes empty columns.
-
-		#### On https://github.com/Roxxik/SameGame/blob/master/old/core.py there is a nice, short algorithm. Test, if it's faster (for different board sizes etc.)!
+		Applies gravity to the board elements and removes empty columns. Each column is partitioned stably into its non-zero elements followed by the zeros, then the empty columns are moved to the end.
 
 		CHANGES THE BOARD IN PLACE!
 		'''
 
-		# starting in the second row from top
-		for y in range(self.rows - 2, -1, -1):
-			# starting from left
-			for x in range(self.columns):
-				if not self.board[x][y]:
-					for newY in range(y, self.rows - 1):
-						self.board[x][newY] = self.board[x][newY+1]
-						self.board[x][newY+1] = 0
-						if not self.board[x][newY]:
-							break
-
-		columnsSubtract = 0
-		for x in range(self.columns - 1, -1, -1):
-			if not self.board[x][0]:
-				for newX in range(x, self.columns - 1):
-					self.board[newX] = self.board[newX+1]
-				columnsSubtract += 1
-
-		for i in range(columnsSubtract):
-			self.board[self.columns - i - 1] = np.zeros(self.origRows, dtype=np.uint8)
-		self.columns -= columnsSubtract
+		occupied = self.board != 0
+		order = np.argsort(~occupied, axis=1, kind='stable')
+		board = np.take_along_axis(self.board, order, axis=1)
+
+		filled = np.any(occupied, axis=1)
+		self.columns = int(np.count_nonzero(filled))
+		self.board[:self.columns] = board[filled]
+		self.board[self.columns:] = 0
 
 		self.rows = self.getHeight()
 
@@ -224,17 +260,305 @@ class Board():
 		:returns: The current active height
 		'''
 
-		# Maybe use np.transpose()
+		filledRows = np.any(self.board, axis=0)
+		if not filledRows.any():
+			return 0
+
+		return len(filledRows) - int(np.argmax(filledRows[::-1]))
+
+
+class BoardBatch():
+	'''
+	Many boards of the same size in one array of the shape (number of boards, columns, rows), so that the boards can be changed and evaluated with one NumPy call for all of them instead of one method call per board.
+
+	For initiation, it demands a list of `Board` objects of the same original size.
+	'''
+
+	def __init__(self, boards):
+		'''
+		Initiating the batch. See class description for details.
+		'''
+
+		self.boards = np.array([b.board for b in boards], dtype=np.uint8).reshape(len(boards), boards[0].origColumns, boards[0].origRows)
+		self.scores = np.array([b.score for b in boards], dtype=np.int64)
+		# The moves of each board as linked list of (move, previousMoves) tuples, so that children share the moves of their parent
+		self.moves = []
+		for b in boards:
+			moves = None
+			for move in b.moves:
+				moves = (move, moves)
+			self.moves.append(moves)
+		self.colors = sorted(set([c for b in boards for c in b.colors]))
+
+
+	def __len__(self):
+		return len(self.boards)
+
+
+	def getBoard(self, i):
+		'''
+		Returns one board of the batch as `Board` object.
+
+		:param i: The index of the board in the batch
+		:returns: The board as `Board`
+		'''
 
-		toSubtract = 0
+		board = Board('[[' + '],['.join([','.join([str(c) for c in column]) for column in self.boards[i].tolist()]) + ']]')
+		board.colors = dict(zip(self.colors, self.countColors()[i].tolist()))
+		board.score = int(self.scores[i])
+		board.moves = self.getMoves(i)
 
-		for y in range(self.rows - 1, -1, -1):
-			for x in range(self.columns):
-				if self.board[x][y]:
-					return self.rows - toSubtract
-			toSubtract += 1
+		return board
 
-		return 0
+
+	def getMoves(self, i):
+		'''
+		Returns the moves of one board of the batch as list.
+
+		:param i: The index of the board in the batch
+		:returns: List of tuples with the coordinates of the moves
+		'''
+
+		moves = []
+		node = self.moves[i]
+		while node is not None:
+			moves.append(node[0])
+			node = node[1]
+		moves.reverse()
+
+		return moves
+
+
+	def countColors(self):
+		'''
+		Counts the elements of each color on each board.
+
+		:returns: An array of the shape (number of boards, number of colors) in the order of `self.colors`
+		'''
+
+		return np.stack([np.count_nonzero(self.boards == c, axis=(1, 2)) for c in self.colors], axis=1)
+
+
+	def calcRemainingPoints(self):
+		'''
+		Calculates the value of all remaining elements of each board according to the competition guidelines.
+
+		:returns: An array with the value for each board
+		'''
+
+		counts = self.countColors()
+
+		return (np.maximum(counts - 1, 0) ** 2).sum(axis=1)
+
+
+	def applyGravity(self):
+		'''
+		Applies gravity to the elements of all boards and removes empty columns (see `Board.applyGravity`).
+
+		CHANGES THE BOARDS IN PLACE!
+		'''
+
+		occupied = self.boards != 0
+		order = np.argsort(~occupied, axis=2, kind='stable')
+		self.boards = np.take_along_axis(self.boards, order, axis=2)
+
+		filled = np.any(occupied, axis=2)
+		order = np.argsort(~filled, axis=1, kind='stable')
+		self.boards = np.take_along_axis(self.boards, order[:, :, np.newaxis], axis=1)
+
+
+	def labelAreas(self):
+		'''
+		Labels the connected areas of all boards at once like `Board.labelAreas`. The labels are flat indices into `self.boards`, so they are unique over the whole batch.
+
+		:returns: A flat array with the label of each element and a flat boolean array that is True for all non-empty elements
+		'''
+
+		boards = self.boards
+		occupied = (boards != 0).ravel()
+		labels = np.arange(boards.size).reshape(boards.shape)
+
+		right = (boards[:, :-1] == boards[:, 1:]) & (boards[:, :-1] != 0)
+		top = (boards[:, :, :-1] == boards[:, :, 1:]) & (boards[:, :, :-1] != 0)
+
+		while True:
+			new = labels.copy()
+			np.minimum(new[:, :-1], np.where(right, labels[:, 1:], new[:, :-1]), out=new[:, :-1])
+			np.minimum(new[:, 1:], np.where(right, labels[:, :-1], new[:, 1:]), out=new[:, 1:])
+			np.minimum(new[:, :, :-1], np.where(top, labels[:, :, 1:], new[:, :, :-1]), out=new[:, :, :-1])
+			np.minimum(new[:, :, 1:], np.where(top, labels[:, :, :-1], new[:, :, 1:]), out=new[:, :, 1:])
+			new = new.ravel()
+			while True:
+				jumped = new[new]
+				if np.array_equal(jumped, new):
+					break
+				new = jumped
+			new = new.reshape(boards.shape)
+			if np.array_equal(new, labels):
+				return labels.ravel(), occupied
+			labels = new
+
+
+	def findAreas(self):
+		'''
+		Finds the clickable areas of all boards.
+
+		:returns: Three arrays: the label of each area (the flat index of its first element), the index of its board and its size
+		'''
+
+		labels, occupied = self.labelAreas()
+		# Every area has exactly one element that is labelled with its own index
+		roots = np.flatnonzero(occupied & (labels == np.arange(labels.size)))
+		sizes = np.bincount(labels[occupied], minlength=labels.size)[roots]
+		clickable = sizes > 1
+		roots = roots[clickable]
+
+		return roots, roots // (self.boards.shape[1] * self.boards.shape[2]), sizes[clickable]
+
+
+	def countAreas(self):
+		'''
+		Counts the clickable areas on each board.
+
+		:returns: An array with the number of clickable areas of each board
+		'''
+
+		roots, boardIndex, sizes = self.findAreas()
+
+		return np.bincount(boardIndex, minlength=len(self))
+
+
+	def expand(self):
+		'''
+		Makes a new batch with all boards that result from one click on any board of this batch. Boards without clickable areas have no children.
+
+		:returns: The new batch and an array with the index of the parent of each new board
+		'''
+
+		labels = self.labelAreas()[0]
+		roots, parents, sizes = self.findAreas()
+		columns, rows = self.boards.shape[1:]
+
+		children = BoardBatch.__new__(BoardBatch)
+		children.colors = self.colors
+		children.boards = self.boards[parents]
+		children.boards[labels.reshape(self.boards.shape)[parents] == roots[:, np.newaxis, np.newaxis]] = 0
+		children.applyGravity()
+		children.scores = self.scores[parents] + (sizes - 1) ** 2
+		xs = roots % (columns * rows) // rows
+		ys = roots % rows
+		children.moves = [((x, y), self.moves[parent]) for parent, x, y in zip(parents.tolist(), xs.tolist(), ys.tolist())]
+
+		return children, parents
+
+
+	def select(self, indices):
+		'''
+		Makes a new batch with some boards of this batch.
+
+		:param indices: Array with the indices of the boards to take over
+		:returns: The new batch
+		'''
+
+		batch = BoardBatch.__new__(BoardBatch)
+		batch.colors = self.colors
+		batch.boards = self.boards[indices]
+		batch.scores = self.scores[indices]
+		batch.moves = [self.moves[i] for i in indices.tolist()]
+
+		return batch
+
+
+	def unique(self):
+		'''
+		Removes boards that occur more than once and keeps the one with the highest score.
+
+		:returns: The new batch
+		'''
+
+		byScore = np.argsort(-self.scores, kind='stable')
+		# Compare each board as one block of bytes, which is much faster than comparing rows of an array
+		flat = np.ascontiguousarray(self.boards[byScore].reshape(len(self), -1))
+		first = np.unique(flat.view(np.dtype((np.void, flat.shape[1]))).ravel(), return_index=True)[1]
+
+		return self.select(np.sort(byScore[first]))
+
+
+class Trace():
+	'''
+	Output of the AIs, with a level of detail:
+	- 0: nothing (the default, so no time is spent on building strings)
+	- 1: progress, e.g. the best score after each layer of a search
+	- 2: additionally the board after each move, as frames separated by an empty line like play.html expects them
+	- 3: additionally debug information
+	The frames are collected and written in blocks of `bufferSize` characters instead of line by line. Lines of `info` are rare and written at once, together with the frames before them.
+	'''
+
+	def __init__(self, level=0, out=None, bufferSize=2**16):
+		'''
+		Initiating the trace.
+
+		:param level: The level of detail (see above)
+		:param out: The file to write to (None for `sys.stdout`)
+		:param bufferSize: Number of characters that are collected before writing
+		'''
+
+		self.level = level
+		self.out = out
+		self.bufferSize = bufferSize
+		self.buffer = []
+		self.size = 0
+
+
+	def write(self, s):
+		'''
+		Adds a string to the output.
+
+		:param s: The string
+		'''
+
+		self.buffer.append(s)
+		self.size += len(s)
+		if self.size >= self.bufferSize:
+			self.flush()
+
+
+	def info(self, *values, level=1):
+		'''
+		Writes a line like `print` does, if the level of the trace is at least `level`.
+
+		:param values: The values to write, separated by a space
+		:param level: The level of detail of the line
+		'''
+
+		if self.level >= level:
+			self.write(' '.join([str(v) for v in values]) + '\n')
+			self.flush()
+
+
+	def frame(self, move, board):
+		'''
+		Adds a frame with the next move and the board, if the level of the trace is at least 2. The board is only converted to a string in that case.
+
+		:param move: The next move as a string
+		:param board: The board before the move
+		'''
+
+		if self.level >= 2:
+			self.write('next move: ' + move + '\n' + str(board) + '\n')
+
+
+	def flush(self):
+		'''
+		Writes the collected output.
+		'''
+
+		if self.buffer:
+			out = self.out or sys.stdout
+			out.write(''.join(self.buffer))
+			out.flush()
+			self.buffer = []
+			self.size = 0
 
 
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -244,64 +568,73 @@ class Board():
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 
-def playShortsightetBestField(board):
+def playShortsightetBestField(board, trace=None):
 	'''
-	AI. Simply clicks on the largest available field until no more clickable fields are available. Prints the field after each move to stdout and infos (if available) to stderr. Finally, returns a string with moves.
+	AI. Simply clicks on the largest available field until no more clickable fields are available. Writes the field after each move to the trace. Finally, returns a string with moves.
 
+	:param trace: The `Trace` for the output (None for no output)
 	:returns: A string with all moves.
 	'''
 
+	if trace is None:
+		trace = Trace()
+
 	availableFields = board.findAreas()
-	print(availableFields)
+	trace.info(availableFields, level=3)
 	while availableFields:
 		# sort available fields by score, then taking the one with the uppermost entry point to not destroy structures above it; chose the best field
 		bestField = sorted(availableFields, key=lambda x: (x[2], x[1]))[-1]
-		print('next move: ' + str(bestField[0]) + ',' + str(bestField[1]))
-		print(board)
+		trace.frame(str(bestField[0]) + ',' + str(bestField[1]), board)
 		# click the best field
 		board.click(bestField[0], bestField[1])
 		# update available fields
 		availableFields = board.findAreas()
 
-	print('next move: No more moves')
-	print(board)
+	trace.frame('No more moves', board)
 	board.score -= board.calcRemainingPoints()
-	print('final score:', board.score)
+	trace.info('final score:', board.score)
 
 	return '[(' + '),('.join([str(x) + ',' + str(y) for x, y in board.moves]) + ')]'
 
 
-def playShortsightetWorstField(board):
+def playShortsightetWorstField(board, trace=None):
 	'''
-	AI. Simply clicks on the smallest available field until no more clickable field are available. Prints the field after each move to stdout and infos (if available) to stderr. Finally, returns a string with moves.
+	AI. Simply clicks on the smallest available field until no more clickable field are available. Writes the field after each move to the trace. Finally, returns a string with moves.
 
+	:param trace: The `Trace` for the output (None for no output)
 	:returns: A string with all moves.
 	'''
 
+	if trace is None:
+		trace = Trace()
+
 	availableFields = board.findAreas()
 	while availableFields:
 		# sort available fields by score
 		worstField = sorted(availableFields, key=lambda x: x[2])[0]
-		print('next move: ' + str(worstField[0]) + ',' + str(worstField[1]))
-		print(board)
+		trace.frame(str(worstField[0]) + ',' + str(worstField[1]), board)
 		# click the best field
 		board.click(worstField[0], worstField[1])
 		# update available fields
 		availableFields = board.findAreas()
 
-	print('next move: No more moves')
-	print(board)
+	trace.frame('No more moves', board)
 	board.score -= board.calcRemainingPoints()
-	print('final score:', board.score)
+	trace.info('final score:', board.score)
 
 	return '[(' + '),('.join([str(x) + ',' + str(y) for x, y in board.moves]) + ')]'
 
 
-def playGraphBasedBasic(board):
+def playGraphBasedBasic(board, trace=None):
 	'''
 	AI. Attempt of an AI that makes a graph of all possible moves and traversing it via BFS-like (breadth-first-search).
+
+	:param trace: The `Trace` for the output (None for no output)
 	'''
 
+	if trace is None:
+		trace = Trace()
+
 	bestBoard = board
 	newList = []
 	oldList = [board]
@@ -314,17 +647,17 @@ def playGraphBasedBasic(board):
 					bestBoard = b
 				continue
 			for c in clickables:
-				bNew = copy.deepcopy(b)
+				bNew = b.copy()
 				bNew.click(c[0], c[1])
 				newList.append(bNew)
 		oldList = newList
 		newList = []
-		print(bestBoard.score, len(oldList))
+		trace.info(bestBoard.score, len(oldList))
 
 	return bestBoard.moves
 
 
-def playGraphBasedNoDoubleBoards(board):
+def playGraphBasedNoDoubleBoards(board, trace=None):
 	'''
 	AI. Attempt of an AI that makes a graph of all possible moves and traversing it via BFS-like (breadth-first-search). It consideres boards that occur twice and only uses the best of the two:
 	       .23    .2.
@@ -332,12 +665,16 @@ def playGraphBasedNoDoubleBoards(board):
 	123                +-- These two boards are equal but usually spaw new branches
 	    -> 12. -> .2. <'
 	       12.    .2.
+
+	:param trace: The `Trace` for the output (None for no output)
 	'''
 
+	if trace is None:
+		trace = Trace()
+
 	bestBoard = board
 	newList = []
 	oldList = [board]
-	knownBoards = set()
 	knownBoardsScore = {}
 
 	while oldList:
@@ -348,24 +685,49 @@ def playGraphBasedNoDoubleBoards(board):
 					bestBoard = b
 				continue
 			for c in clickables:
-				bNew = copy.deepcopy(b)		#### Can I optimize the deepcopy-Part? I guess, it takes quite some time!
+				bNew = b.copy()
 				bNew.click(c[0], c[1])
-				boardHash = bNew.board.tostring()
-				if boardHash in knownBoards:
-					if knownBoardsScore[boardHash] < bNew.score:
-						knownBoardsScore[boardHash] = bNew.score
-						newList.append(bNew)
-				else:
-					knownBoards.add(boardHash)
+				boardHash = hash(bNew.board.tobytes())
+				if boardHash not in knownBoardsScore or knownBoardsScore[boardHash] < bNew.score:
 					knownBoardsScore[boardHash] = bNew.score
 					newList.append(bNew)
 		oldList = newList
 		newList = []
-		print(bestBoard.score, len(oldList))
+		trace.info(bestBoard.score, len(oldList))
 
 	return bestBoard.moves
 
 
+def playGraphBasedBatched(board, trace=None):
+	'''
+	AI. Same as `playGraphBasedNoDoubleBoards`, but each layer of the BFS is a `BoardBatch`, so expanding, removing double boards and scoring a layer are a few array operations instead of one method call per board.
+
+	:param trace: The `Trace` for the output (None for no output)
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	bestScore = board.score - board.calcRemainingPoints()
+	bestMoves = []
+	layer = BoardBatch([board])
+
+	while len(layer):
+		children, parents = layer.expand()
+		# Boards without children are finished
+		finished = np.setdiff1d(np.arange(len(layer)), parents)
+		if len(finished):
+			finalScores = layer.scores[finished] - layer.calcRemainingPoints()[finished]
+			best = int(np.argmax(finalScores))
+			if finalScores[best] > bestScore:
+				bestScore = int(finalScores[best])
+				bestMoves = layer.getMoves(finished[best])
+		layer = children.unique() if len(children) else children
+		trace.info(bestScore, len(layer))
+
+	return bestMoves
+
+
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 # #                                                                 # #
 # #                 Helper functions start here                     # #
@@ -373,26 +735,25 @@ def playGraphBasedNoDoubleBoards(board):
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
 
-def runSequence(board, sequence):
+def runSequence(board, sequence, trace=None):
 	'''
 	Applies a given sequence on a given board.
 
 	:param board: Board object on which to apply the sequence
 	:param sequence: List of tuples with coordinates of fields to click
+	:param trace: The `Trace` for the frames (None to write them to stdout)
 	'''
 
-	print('Next move: ' + str(sequence[0]))
-	print(board)
+	if trace is None:
+		trace = Trace(2)
 
-	for i, c in enumerate(sequence):
+	for c in sequence:
+		trace.frame(str(c[0]) + ',' + str(c[1]), board)
 		board.click(c[0], c[1])
-		if i < len(sequence)-1:
-			print('Next move: ' + str(sequence[i+1]))
-		else:
-			print('Next move: No more moves')
-		print(board)
 
-	print('Final score: ' + str(board.score - board.calcRemainingPoints()))
+	trace.frame('No more moves', board)
+	trace.info('final score:', board.score - board.calcRemainingPoints())
+	trace.flush()
 
 
 def usage():
@@ -493,6 +854,6 @@ if __name__ == "__main__":
 	#quit()
 
 	if board:
-		now = time.clock()
+		now = time.perf_counter()
 		print(playGraphBasedNoDoubleBoards(board), file=sys.stderr)
-		print(time.clock()-now)
+		print(time.perf_counter()-now)
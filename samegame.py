@@ -1,13 +1,41 @@
 import sys
 import random
-import copy
 import time
+import collections
+import itertools
+import array
+import heapq
+import struct
+import os
+import asyncio
+import contextlib
+import cProfile
+import pstats
+import importlib.util
+import json
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing
+import multiprocessing.shared_memory
+import tempfile
+import mmap
+import queue
+import traceback
+
+
+# What `click` returns to be able to take the click back with `undo`:
+# color: the color of the removed field
+# removed: the number of removed elements
+# saved: the changed parts of the board before the click (depends on the board class)
+# rows, columns, score: the values before the click
+UndoRecord = collections.namedtuple('UndoRecord', ['color', 'removed', 'saved', 'rows', 'columns', 'score'])
+
 
 class Board():
 	'''
 	A class to simulate a board of samegame as described in the competition guidelines at http://samegame.asta-wedel.de
 
-	For initiation, it demands a board in the one-line representation (see guidelines) as a string.
+	For initiation, it demands a board in the one-line representation (see guidelines) or in tab-separated format, as string or bytes, or a list of columns (see `parseGrid`).
 	'''
 
 	def __init__(self, grid):
@@ -15,23 +43,8 @@ class Board():
 		Initiating the board. See class description for details.
 		'''
 
-		# Read in board from one-line grid
-		# Remove all spaces and the first and last two brackets
-		grid = grid.replace(' ', '')[2:-2]
-		# Save board as list of lists of integers
-		self.board = []
-		# Save the number of each color as a dictionary
-		self.colors = {}
-		for elem in grid.split('],['):
-			row = []
-			for a in elem.split(','):
-				b = int(a)
-				row.append(int(b))
-				if b:
-					if b not in self.colors:
-						self.colors[b] = 0
-					self.colors[b] += 1
-			self.board.append(row)
+		# Save board as list of lists of integers and the number of each color as a dictionary
+		self.board, self.colors = parseGrid(grid)
 
 		self.numOfColors = len(self.colors)
 
@@ -64,12 +77,13 @@ class Board():
 		for y in range(self.origRows - 1, -1, -1):
 			line = str(y%10) + ' | '
 			for x in range(self.origColumns):
-				if not self.board[x][y]:
+				color = self.getColor(x, y)
+				if not color:
 					line += '. '
-				elif self.board[x][y] < 75:
-					line += chr(self.board[x][y] + 48) + ' '
+				elif color < 75:
+					line += chr(color + 48) + ' '
 				else:
-					line += str(self.board[x][y]) + ' '
+					line += str(color) + ' '
 			lines.append(line)
 
 		lines.append('^y ' + '-'*(self.origColumns*2))
@@ -78,6 +92,18 @@ class Board():
 		return '\n'.join(lines) + '\n'
 
 
+	def getColor(self, x, y):
+		'''
+		Returns the color of one element of the board (0 for an empty element).
+
+		:param x: The x-coordinate (column) of the element
+		:param y: The y-coordinate (row) of the element
+		:returns: The color of the element
+		'''
+
+		return self.board[x][y]
+
+
 	def floodFill(self, x, y):
 		'''
 		Returns all elements that belong to a field starting with a given coordinate. Uses a iterative floodfill algorithm using a not-so-standard queue approach using a set.
@@ -115,9 +141,11 @@ class Board():
 		return toChange
 
 
-	def findAreas(self):
+	def findAreas(self, withCells=True):
 		'''
 		Finds all clickable areas with more than one element in the board.
+
+		:param withCells: If False, the areas are returned as `(x, y, size)` without the set of elements
 		'''
 
 		inArea = set()
@@ -129,30 +157,63 @@ class Board():
 					area = self.floodFill(x, y)
 					inArea.update(area)
 					if len(area) > 1:
-						areaEntries.append((x, y, len(area), area))
+						if withCells:
+							areaEntries.append((x, y, len(area), area))
+						else:
+							areaEntries.append((x, y, len(area)))
 
 		return areaEntries
 
 
-	def click(self, x, y, toChange=None):
+	def click(self, x, y, toChange=None, undoable=False):
 		'''
 		Performs a "click" on a board element. If the element is 0 or it has no neighbours with the same number, nothing happens. If it has at least one neighbour with the same number, the whole field is removed, gravity applies, and the player is rewarded with points for removing the field. The number of colors is updated.
 		CHANGES THE BOARD IN PLACE!
 
 		:param x: The x-coordinate (column) of the click
 		:param y: The y-coordinate (row) of the click
+		:param toChange: Optional set of the elements of the field (as returned by `floodFill`)
+		:param undoable: If True, an `UndoRecord` is returned that can be given to `undo` to restore the board as it was before the click
+		:returns: The `UndoRecord` if `undoable` is True and the click removed a field, otherwise None
 		'''
 
 		if self.board[x][y]:
 			if toChange is None:
 				toChange = self.floodFill(x, y)
 			if len(toChange) > 1:
-				self.colors[self.board[x][y]] -= len(toChange)
+				color = self.board[x][y]
+				record = None
+				if undoable:
+					# Gravity changes the columns with removed elements in place and moves the other columns around. Save the former and the order of all.
+					changed = set([cx for cx, cy in toChange])
+					saved = (list(self.board), [(cx, self.board[cx][:]) for cx in changed])
+					record = UndoRecord(color, len(toChange), saved, self.rows, self.columns, self.score)
+				self.colors[color] -= len(toChange)
 				for x, y in toChange:
 					self.board[x][y] = 0
 				self.applyGravity()
 				self.score += self.calcScore(len(toChange))
 				self.moves.append((x, y))
+				return record
+
+
+	def undo(self, record):
+		'''
+		Takes back a click, so that the board is exactly as before the click. Only the last click that was not undone yet can be undone.
+		CHANGES THE BOARD IN PLACE!
+
+		:param record: The `UndoRecord` returned by `click`
+		'''
+
+		order, changed = record.saved
+		self.board[:] = order
+		for x, column in changed:
+			self.board[x][:] = column
+		self.colors[record.color] += record.removed
+		self.rows = record.rows
+		self.columns = record.columns
+		self.score = record.score
+		self.moves.pop()
 
 
 	def calcScore(self, n):
@@ -236,275 +297,4039 @@ class Board():
 		return 0
 
 
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# #                                                                 # #
-# #                        AIs start here                           # #
-# #                                                                 # #
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+class UnionFindBoard(Board):
+	'''
+	Same as `Board`, but `findAreas` labels all areas in one scan over the board with a union-find structure in flat lists instead of flood filling each area with sets of tuples.
+	'''
 
+	def findAreas(self, withCells=True):
+		'''
+		Finds all clickable areas with more than one element in the board.
+		Every element is joined with the element below and left of it, if they have the same color. Path compression (by halving) and union by rank keep the trees flat.
 
-def playShortsightedBestField(board):
-	'''
-	AI. Simply clicks on the largest available field until no more clickable fields are available. Prints the field after each move to stdout and infos (if available) to stderr. Finally, returns a string with moves.
+		:param withCells: If False, the areas are returned as `(x, y, size)` without the set of elements
+		'''
 
-	:returns: A string with all moves.
-	'''
+		board = self.board
+		rows = self.rows
+		parent = list(range(self.columns * rows))
+		rank = [0] * len(parent)
 
-	availableFields = board.findAreas()
-	print(availableFields)
-	while availableFields:
-		# sort available fields by score, then taking the one with the uppermost entry point to not destroy structures above it; chose the best field
-		bestField = sorted(availableFields, key=lambda x: (x[2], x[1]))[-1]
-		print('next move: ' + str(bestField[0]) + ',' + str(bestField[1]))
-		print(board)
-		# click the best field
-		board.click(bestField[0], bestField[1])
-		# update available fields
-		availableFields = board.findAreas()
+		for x in range(self.columns):
+			column = board[x]
+			left = board[x-1] if x else None
+			for y in range(rows):
+				color = column[y]
+				if not color:
+					continue
+				i = x * rows + y
+				if y and column[y-1] == color:
+					parent[i] = i - 1
+				if left and left[y] == color:
+					# Union of the trees of i and its left neighbour
+					a = i
+					while parent[a] != a:
+						parent[a] = parent[parent[a]]
+						a = parent[a]
+					b = i - rows
+					while parent[b] != b:
+						parent[b] = parent[parent[b]]
+						b = parent[b]
+					if a != b:
+						if rank[a] < rank[b]:
+							parent[a] = b
+						elif rank[a] > rank[b]:
+							parent[b] = a
+						else:
+							parent[b] = a
+							rank[a] += 1
 
-	print('next move: No more moves')
-	print(board)
-	board.score -= board.calcRemainingPoints()
-	print('final score:', board.score)
+		# Collect the areas. The first element of an area in the scan is its entry point.
+		sizes = {}
+		first = {}
+		cells = {}
+		for x in range(self.columns):
+			column = board[x]
+			for y in range(rows):
+				if not column[y]:
+					continue
+				a = x * rows + y
+				while parent[a] != a:
+					parent[a] = parent[parent[a]]
+					a = parent[a]
+				if a in sizes:
+					sizes[a] += 1
+					if withCells:
+						cells[a].append((x, y))
+				else:
+					sizes[a] = 1
+					first[a] = (x, y)
+					if withCells:
+						cells[a] = [(x, y)]
 
-	return '[(' + '),('.join([str(x) + ',' + str(y) for x, y in board.moves]) + ')]'
+		areaEntries = []
+		for a in first:
+			if sizes[a] > 1:
+				if withCells:
+					areaEntries.append((first[a][0], first[a][1], sizes[a], set(cells[a])))
+				else:
+					areaEntries.append((first[a][0], first[a][1], sizes[a]))
+
+		return areaEntries
 
 
-def playShortsightedWorstField(board):
+class BitBoard(Board):
 	'''
-	AI. Simply clicks on the smallest available field until no more clickable field are available. Prints the field after each move to stdout and infos (if available) to stderr. Finally, returns a string with moves.
+	A drop-in replacement for `Board` that stores the board as one bit plane (a Python integer) per color instead of a list of lists.
 
-	:returns: A string with all moves.
+	The element (x, y) is bit `x * self.stride + y` of a plane. Every column gets one more bit than the board has rows. This extra bit is always 0, so shifting a plane by one never leaks into the neighbouring column. Flood fill is done by bitwise dilation and gravity by compacting the bits of each column.
+
+	`floodFill` returns a bit mask instead of a set of coordinates and `findAreas` returns these masks as fourth element. `click` accepts them like the sets of `Board`, so all AIs work with both classes.
+
+	A click only works on whole planes, apart from the few columns gravity has to close holes in. `findAreas` still dilates every area of more than two elements one by one, and each dilation shifts the whole plane, so it is only about 1.5 to 3 times as fast as `Board.findAreas` and limits AIs that call it after every move.
 	'''
 
-	availableFields = board.findAreas()
-	while availableFields:
-		# sort available fields by score
-		worstField = sorted(availableFields, key=lambda x: x[2])[0]
-		print('next move: ' + str(worstField[0]) + ',' + str(worstField[1]))
-		print(board)
-		# click the best field
-		board.click(worstField[0], worstField[1])
-		# update available fields
-		availableFields = board.findAreas()
+	def __init__(self, grid):
+		'''
+		Initiating the board. See class description for details.
+		'''
 
-	print('next move: No more moves')
-	print(board)
-	board.score -= board.calcRemainingPoints()
-	print('final score:', board.score)
+		Board.__init__(self, grid)
 
-	return '[(' + '),('.join([str(x) + ',' + str(y) for x, y in board.moves]) + ')]'
+		# Bits per column (one more than rows, see class description)
+		self.stride = self.origRows + 1
+		self.columnMask = (1 << self.origRows) - 1
+		# The lowest bit of every column, and the bits of every column without the extra bit
+		self.bottomMask = sum([1 << (x * self.stride) for x in range(self.origColumns)])
+		self.elementMask = self.bottomMask * self.columnMask
 
+		# Save board as dictionary of color -> bit plane
+		planes = {c: 0 for c in self.colors}
+		for x in range(self.columns):
+			for y in range(self.rows):
+				if self.board[x][y]:
+					planes[self.board[x][y]] |= 1 << (x * self.stride + y)
+		self.board = planes
 
-def playGraphBasedBasic(board):
-	'''
-	AI. Attempt of an AI that makes a graph of all possible moves and traversing it via BFS-like (breadth-first-search).
-	'''
 
-	bestBoard = board
-	newList = []
-	oldList = [board]
+	def getColor(self, x, y):
+		'''
+		Returns the color of one element of the board (0 for an empty element).
 
-	while oldList:
-		for b in oldList:
-			clickables = b.findAreas()
-			if not clickables:
-				if b.score > bestBoard.score:
-					bestBoard = b
-				continue
-			for c in clickables:
-				bNew = copy.deepcopy(b)
-				bNew.click(c[0], c[1])
-				newList.append(bNew)
-		oldList = newList
-		newList = []
-		print(bestBoard.score, len(oldList))
+		:param x: The x-coordinate (column) of the element
+		:param y: The y-coordinate (row) of the element
+		:returns: The color of the element
+		'''
 
-	return bestBoard.moves
+		bit = 1 << (x * self.stride + y)
+		for c in self.board:
+			if self.board[c] & bit:
+				return c
 
-#@profile
-def playGraphBasedNoDoubleBoards(board):
-	'''
-	AI. Attempt of an AI that makes a graph of all possible moves and traversing it via BFS-like (breadth-first-search). It consideres boards that occur twice and only uses the best of the two:
-	       .23    .2.
-	123 -> .23 -> .2. <,
-	123                +-- These two boards are equal but usually spaw new branches
-	    -> 12. -> .2. <'
-	       12.    .2.
-	'''
+		return 0
 
-	##### Deepcopy needs about 85% of the total run time.
 
-	bestBoard = board
-	newList = []
-	oldList = [board]
-	knownBoards = set()
-	knownBoardsScore = {}
+	def dilate(self, start, plane):
+		'''
+		Grows an area from one element into all neighbouring elements that are set in `plane` until it does not grow any more.
+		The area is grown in a small window of columns starting at the column of `start`. The window is doubled to the right whenever the area reaches its last column, and to the left whenever the area has a neighbour in the column left of the window. This keeps the integers small for the many small fields. `findAreas` starts from the first element of each field, so its window never has to grow to the left.
 
-	while oldList:
-		for b in oldList:
-			clickables = b.findAreas()
-			if not clickables:
-				b.score -= b.calcRemainingPoints()
-				if b.score > bestBoard.score:
-					bestBoard = b
-				continue
-			for c in clickables:
-				bNew = copy.deepcopy(b)
-				bNew.click(c[0], c[1], c[3])
-				boardHash = hash(repr(bNew.board))
-				if boardHash in knownBoards:
-					if knownBoardsScore[boardHash] < bNew.score:
-						knownBoardsScore[boardHash] = bNew.score
-						newList.append(bNew)
-				else:
-					knownBoards.add(boardHash)
-					knownBoardsScore[boardHash] = bNew.score
-					newList.append(bNew)
-		oldList = newList
-		newList = []
-		print(bestBoard.score, len(oldList))
+		:param start: Bit position of the element to start from
+		:param plane: Bit plane of the color of the area
+		:returns: Bit mask of the whole field
+		'''
 
-	return bestBoard.moves
+		s = self.stride
+		lo = start // s
+		hi = lo + 4
+		area = 1 << start
+		while True:
+			base = lo * s
+			width = (hi - lo) * s
+			# The column left of the window is cut out together with the window
+			if lo:
+				window = (plane >> (base - s)) & ((1 << (width + s)) - 1)
+				leftColumn = window & self.columnMask
+				window >>= s
+			else:
+				window = (plane >> base) & ((1 << width) - 1)
+				leftColumn = 0
+			area >>= base
+			while True:
+				grown = (area | area << 1 | area >> 1 | area << s | area >> s) & window
+				if grown == area:
+					break
+				area = grown
+			# Elements of the field in the first column of the window with a neighbour of the same color left of them
+			left = area & leftColumn
+			right = area >> (width - s)
+			area <<= base
+			if not left and not right:
+				return area
+			if left:
+				lo = max(0, lo - (hi - lo))
+			if right:
+				hi += hi - lo
 
 
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# #                                                                 # #
-# #                Helper functions start here                      # #
-# #                                                                 # #
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+	def floodFill(self, x, y):
+		'''
+		Returns all elements that belong to a field starting with a given coordinate. Uses bitwise dilation on the bit plane of the color.
+		This method does NOT change the board!
 
+		:param x: The x-coordinate (column) of the element to start from
+		:param y: The y-coordinate (row) of the element to start from
+		:returns: A bit mask of the elements that belong to the field (0 for an empty element)
+		'''
 
-def runSequence(board, sequence):
-	'''
-	Applies a given sequence on a given board.
+		start = x * self.stride + y
+		for c in self.board:
+			if self.board[c] >> start & 1:
+				return self.dilate(start, self.board[c])
 
-	:param board: Board object on which to apply the sequence
-	:param sequence: List of tuples with coordinates of fields to click
-	'''
+		return 0
 
-	print('Next move: ' + str(sequence[0]))
-	print(board)
 
-	for i, c in enumerate(sequence):
-		board.click(c[0], c[1])
-		if i < len(sequence)-1:
-			print('Next move: ' + str(sequence[i+1]))
-		else:
-			print('Next move: No more moves')
-		print(board)
+	def findAreas(self, withCells=True):
+		'''
+		Finds all clickable areas with more than one element in the board. The areas are returned in the same order as by `Board.findAreas`, but the fourth element is a bit mask.
 
-	print('Final score: ' + str(board.score - board.calcRemainingPoints()))
+		:param withCells: If False, the areas are returned as `(x, y, size)` without the bit mask
+		'''
 
+		s = self.stride
+		areaEntries = []
 
-def usage():
-	'''
-	Prints program usage.
-	'''
+		for c in self.board:
+			plane = self.board[c]
+			# Elements with a neighbour of the same color above, below, right and left of them
+			up = plane & plane >> 1
+			down = plane & plane << 1
+			right = plane & plane >> s
+			left = plane & plane << s
+			# Only elements with a neighbour of the same color can belong to a clickable area
+			some = up | down | right | left
+			many = up & (down | right | left) | down & (right | left) | right & left
+			single = some & ~many
+			# Two elements that only have each other as neighbour are a field of two. These are by far the most common fields, so they are found without flood fill.
+			vertical = single & up & single >> 1
+			horizontal = single & right & single >> s
+			for i in bitPositions(vertical):
+				areaEntries.append((i // s, i % s, 2, 3 << i))
+			for i in bitPositions(horizontal):
+				areaEntries.append((i // s, i % s, 2, (1 | 1 << s) << i))
+			left = some & ~(vertical | vertical << 1 | horizontal | horizontal << s)
+			while left:
+				start = (left & -left).bit_length() - 1
+				area = self.dilate(start, plane)
+				left &= ~area
+				areaEntries.append((start // s, start % s, bitCount(area), area))
 
-	print('Usage:')
-	print('Input via stdin: python3 samegame.py')
-	print('Input via argument: python3 samegame.py [[0, 1],[0, 1]]')
-	print('Input from file with one line in file: python3 samegame.py filename.txt')
-	print('Input from file as grid (tsv): python3 samegame.py grid filename.txt')
-	print('Random board with size 8 x 5 and color distribution 1,2,1,1: python3 samegame.py 8 5 1,2,1,1')
-	print('Random board as above with seed 42: python3 samegame.py 8 5 1,2,1,1 42')
+		# Sort like Board.findAreas (no two areas share the first element)
+		areaEntries.sort()
 
+		if not withCells:
+			return [a[:3] for a in areaEntries]
 
-def gridToOneLine(s):
-	'''
-	Converts a board in tab-separated format to the one-line format described in the competition guidelines.
+		return areaEntries
 
-	:param s: The board in tab-separated format
-	:returns: The board in one-line format
-	'''
 
-	grid = []
-	for line in s.split('\n'):
-		grid.append(', '.join(line.split()))
+	def click(self, x, y, toChange=None, undoable=False):
+		'''
+		Performs a "click" on a board element. If the element is 0 or it has no neighbours with the same number, nothing happens. If it has at least one neighbour with the same number, the whole field is removed, gravity applies, and the player is rewarded with points for removing the field. The number of colors is updated.
+		CHANGES THE BOARD IN PLACE!
 
-	return '[[' + '], ['.join(grid) + ']]'
+		:param x: The x-coordinate (column) of the click
+		:param y: The y-coordinate (row) of the click
+		:param toChange: Optional bit mask of the field (as returned by `floodFill`)
+		:param undoable: If True, an `UndoRecord` is returned that can be given to `undo` to restore the board as it was before the click
+		:returns: The `UndoRecord` if `undoable` is True and the click removed a field, otherwise None
+		'''
 
+		if toChange is None:
+			toChange = self.floodFill(x, y)
+		n = bitCount(toChange)
+		if n > 1:
+			low = toChange & -toChange
+			for c in self.board:
+				if self.board[c] & low:
+					break
+			record = None
+			if undoable:
+				# The planes are integers, so a shallow copy of the dictionary saves the whole board
+				record = UndoRecord(c, n, dict(self.board), self.rows, self.columns, self.score)
+			self.board[c] &= ~toChange
+			self.colors[c] -= n
+			self.applyGravity()
+			self.score += self.calcScore(n)
+			self.moves.append((x, y))
+			return record
 
-def randomBoard(cols, rows, colorDistribution, seed=None):
+
+	def undo(self, record):
+		'''
+		Takes back a click, so that the board is exactly as before the click. Only the last click that was not undone yet can be undone.
+		CHANGES THE BOARD IN PLACE!
+
+		:param record: The `UndoRecord` returned by `click`
+		'''
+
+		self.board.update(record.saved)
+		self.colors[record.color] += record.removed
+		self.rows = record.rows
+		self.columns = record.columns
+		self.score = record.score
+		self.moves.pop()
+
+
+	def applyGravity(self):
+		'''
+		Applies gravity to the board elements and removes empty columns. Holes in a column are closed by shifting the bits above them down by one. The columns with holes and the empty columns are found for the whole board at once, so only they are handled one by one.
+
+		CHANGES THE BOARD IN PLACE!
+		'''
+
+		s = self.stride
+		colMask = self.columnMask
+		planes = self.board
+
+		occupied = 0
+		for c in planes:
+			occupied |= planes[c]
+		# Empty elements with an element right above them
+		dropping = ~occupied & (occupied >> 1) & self.elementMask
+		for x in sorted(set([i // s for i in bitPositions(dropping)])):
+			base = x * s
+			column = (occupied >> base) & colMask
+			holes = ((1 << column.bit_length()) - 1) & ~column
+			segment = ~(colMask << base)
+			for c in planes:
+				column = (planes[c] >> base) & colMask
+				if not column:
+					continue
+				h = holes
+				while h:
+					y = h.bit_length() - 1
+					h ^= 1 << y
+					low = (1 << y) - 1
+					column = (column & low) | ((column >> 1) & ~low)
+				planes[c] = (planes[c] & segment) | (column << base)
+
+		occupied = 0
+		for c in planes:
+			occupied |= planes[c]
+		# After gravity, a column is empty if its lowest element is
+		empty = ~occupied & self.bottomMask & ((1 << (self.columns * s)) - 1)
+		for i in reversed(bitPositions(empty)):
+			low = (1 << i) - 1
+			for c in planes:
+				planes[c] = (planes[c] & low) | ((planes[c] >> (i + s)) << i)
+			occupied = (occupied & low) | ((occupied >> (i + s)) << i)
+		self.columns -= bitCount(empty)
+
+		self.rows = self.getHeight(occupied)
+
+
+	def getHeight(self, occupied=None):
+		'''
+		Determines the active height of the board (that is, the maximum height of any non-zero number). The columns are combined by folding the board in halves, so only a few operations on the whole board are needed.
+
+		:param occupied: Optional bit mask of all elements, if it is known already
+		:returns: The current active height
+		'''
+
+		if occupied is None:
+			occupied = 0
+			for c in self.board:
+				occupied |= self.board[c]
+
+		columns = self.columns
+		while columns > 1:
+			half = (columns + 1) // 2
+			occupied = (occupied | occupied >> (half * self.stride)) & ((1 << (half * self.stride)) - 1)
+			columns = half
+
+		return (occupied & self.columnMask).bit_length()
+
+
+class AreaIndexBoard(Board):
 	'''
-	Taken (and only slightly modified) from https://github.com/Roxxik/SameGame/blob/master/old/core.py
+	Same as `Board`, but keeps an index of all clickable areas that is updated with every click, so `findAreas` does not need to flood fill the whole board again.
 
-	Generates a random board with `cols` columns and `rows` rows. It has `len(colorDistribution)` with a distribution given in `colorDistribution`. A distribution of `[1, 2, 1]` means that there are as many 2's as there are 1's and 3's.
+	`self.areaId[x][y]` is the id of the area of element (x, y), -1 for an element without neighbours of the same color and 0 for an empty element. `self.areas[id]` is the tuple `(x, y, size, cells)` of the area as returned by `findAreas`, (x, y) being its first element.
 
-	:param cols: The number of columns of the board
-	:param rows: The number of rows of the board
-	:param colorDistribution: List with color distribution as described above
-	:param seed: Seed to initialize the pseudo random number generator to get reproducable boards
-	:returns: The generated board as a one-line string as described in the competition guidelines
+	After a click only the areas with an element that moves or is next to an element that moves are filled again. All other areas keep their entry (only their x-coordinates change, if columns are removed left of them).
 	'''
 
-	colorSum = sum(colorDistribution)
-	if seed is not None:
-		random.seed(seed)
-	coords = [(i, j) for i in range (cols) for j in range (rows)]
-	random.shuffle(coords)
-	board = [[0 for i in range (cols)] for j in range (rows)]
-	fields = cols * rows
-	for color, colorAmount in enumerate(colorDistribution, start = 1):
-		coloredFields = fields * colorAmount // colorSum
-		for (x, y) in coords[:coloredFields]:
-			board[y][x] = color
-		coords = coords[coloredFields:]
-	for color, (x, y) in enumerate(coords, start=1):
-		board[y][x] = color
+	def __init__(self, grid):
+		'''
+		Initiating the board. See class description for details.
+		'''
 
-	oneLineBoard = '[[' + '],['.join([','.join([str(x) for x in a]) for a in board]) + ']]'
+		Board.__init__(self, grid)
+		self.buildIndex()
 
-	return oneLineBoard
 
+	def buildIndex(self):
+		'''
+		Builds the area index from scratch.
+		'''
 
-testgrid = '[[3,2,3,3,1,1,2,3,1,1,2,3],[3,2,2,1,1,3,3,3,1,2,2,1],[3,3,2,1,1,1,2,3,1,1,2,3],[3,2,2,1,1,2,3,3,2,3,2,2],[1,2,3,1,1,3,2,3,3,2,3,1],[2,3,1,1,2,1,1,3,1,2,3,1],[1,3,2,2,3,2,1,2,2,3,1,1]]'
+		self.areaId = [[0] * self.origRows for x in range(self.origColumns)]
+		self.areas = {}
+		self.nextId = 1
+		self.labelAreas([(x, y) for x in range(self.columns) for y in range(self.rows)])
 
 
-if __name__ == "__main__":
+	def labelAreas(self, cells):
+		'''
+		Flood fills all given elements that are not empty and do not have an id yet and adds their areas to the index.
 
-	board = False
+		:param cells: Iterable of tuples with coordinates (x,y)
+		'''
 
-	# If no argument is given, ask for the field via STDIN.
-	# If one argument is given and it is `-h`, print usage, if the argument is `test`, use the testboard. In any other case, assume that the argument is the board.
-	# If two arguments are given assume that the second argument is a filename with the grid. The style of the grid in the file depends on the first argument (`oneline`: as usual; `grid`: in tsv format). If the keyword is missing, or the file does not exist, print usage.
-	# If three or four arguments are given, generate a random board with the first arg as width, second as height and third as color distribution. The optional fourth argument serves as seed for the pseudo-random number generator
+		for x, y in cells:
+			if self.board[x][y] and not self.areaId[x][y]:
+				area = self.floodFill(x, y)
+				if len(area) == 1:
+					self.areaId[x][y] = -1
+					continue
+				areaId = self.nextId
+				self.nextId += 1
+				for cx, cy in area:
+					self.areaId[cx][cy] = areaId
+				first = min(area)
+				self.areas[areaId] = (first[0], first[1], len(area), area)
 
-	if len(sys.argv) == 1:
-		board = Board(input('Enter the field in one line: '))
-	elif len(sys.argv) == 2:
-		if sys.argv[1] == 'test':
-			board = Board(testgrid)
-		elif sys.argv[1] == '-h':
-			usage()
-		else:
-			board = Board(sys.argv[1])
-	elif len(sys.argv) == 3:
-		try:
-			with open(sys.argv[2], 'r') as f:
-				if sys.argv[1] == 'oneline':
-					board = Board(f.read().rstrip())
-				elif sys.argv[1] == 'grid':
-					board = Board(gridToOneLine(f.read().rstrip()))
-				else:
-					usage()
-		except OSError:
-			print('Could not find file {}'.format(sys.argv[2]))
-			usage()
-	elif len(sys.argv) == 4:
-		board = Board(randomBoard(int(sys.argv[1]), int(sys.argv[2]), [int(x) for x in sys.argv[3].split(',')]))
-	elif len(sys.argv) == 5:
-		board = Board(randomBoard(int(sys.argv[1]), int(sys.argv[2]), [int(x) for x in sys.argv[3].split(',')], int(sys.argv[4])))
-	else:
-		usage()
 
-	#if board:
-	#	runSequence(board, [(1, 1), (2, 2), (2, 2), (4, 0), (5, 3), (5, 3), (4, 0), (4, 0), (4, 0)])
+	def findAreas(self, withCells=True):
+		'''
+		Finds all clickable areas with more than one element in the board. Reads them from the index.
 
-	#quit()
+		:param withCells: If False, the areas are returned as `(x, y, size)` without the set of elements
+		'''
 
-	if board:
-		now = time.clock()
-		print(playShortsightedBestField(board), file=sys.stderr)
-		print(time.clock()-now)
+		# Sort like Board.findAreas (no two areas share the first element)
+		if withCells:
+			return sorted(self.areas.values())
+
+		return sorted([a[:3] for a in self.areas.values()])
+
+
+	def click(self, x, y, toChange=None, undoable=False):
+		'''
+		Performs a "click" on a board element like `Board.click` and updates the area index.
+		CHANGES THE BOARD IN PLACE!
+
+		:param x: The x-coordinate (column) of the click
+		:param y: The y-coordinate (row) of the click
+		:param toChange: Optional set of the elements of the field (as returned by `floodFill`)
+		:param undoable: If True, an `UndoRecord` is returned that can be given to `undo` to restore the board as it was before the click
+		:returns: The `UndoRecord` if `undoable` is True and the click removed a field, otherwise None
+		'''
+
+		if self.areaId[x][y] <= 0:
+			return None
+		if toChange is None:
+			toChange = self.areas[self.areaId[x][y]][3]
+
+		# Removed elements per column
+		removed = {}
+		for cx, cy in toChange:
+			if cx not in removed:
+				removed[cx] = set()
+			removed[cx].add(cy)
+
+		# Columns that are empty after the click
+		vanished = [cx for cx in removed if len(removed[cx]) == len([c for c in self.board[cx] if c])]
+		lowestDirty, newX = clickRegion(removed, vanished, self.columns)
+
+		dirtyIds = set()
+		dirtyCells = []
+		for nx, ny in lowestDirty.items():
+			column = self.areaId[nx]
+			for cy in range(ny, self.rows):
+				if column[cy] > 0:
+					dirtyIds.add(column[cy])
+				elif column[cy] < 0:
+					dirtyCells.append((nx, cy))
+		for areaId in dirtyIds:
+			dirtyCells.extend(self.areas.pop(areaId)[3])
+
+		record = Board.click(self, x, y, toChange, undoable)
+
+		# Move the columns of the index like the columns of the board
+		if vanished:
+			self.areaId = [column for cx, column in enumerate(self.areaId) if cx not in vanished]
+			for cx in vanished:
+				self.areaId.append([0] * self.origRows)
+
+		# Clear the old ids of the columns with removed elements and of all elements that are filled again
+		for cx in removed:
+			if cx not in vanished:
+				column = self.areaId[newX[cx]]
+				for cy in range(min(removed[cx]), self.origRows):
+					column[cy] = 0
+		cells = moveCells(dirtyCells, removed, newX)
+		for cx, cy in cells:
+			self.areaId[cx][cy] = 0
+
+		# Areas right of removed columns keep their shape, but move left
+		if vanished:
+			firstVanished = min(vanished)
+			for areaId in self.areas:
+				if self.areas[areaId][0] > firstVanished:
+					self.areas[areaId] = moveArea(self.areas[areaId], newX)
+
+		self.labelAreas(cells)
+
+		return record
+
+
+	def undo(self, record):
+		'''
+		Takes back a click like `Board.undo`. The area index is built from scratch.
+		CHANGES THE BOARD IN PLACE!
+
+		:param record: The `UndoRecord` returned by `click`
+		'''
+
+		Board.undo(self, record)
+		self.buildIndex()
+
+
+class BoardState():
+	'''
+	An immutable board for searching. `click` does not change the state, but returns a new one that shares every column the click did not touch with its parent. The moves are a persistent linked list of `(move, previousMoves)` tuples that is shared with the parent as well. Branching therefore only costs the changed columns instead of a deep copy of the whole board.
+
+	The board is a tuple of columns, each column being a tuple of the colors from bottom to top without empty elements. Empty columns are removed. Equal boards thus have equal (and hashable) `board` tuples.
+
+	`zobrist` is a 64 bit Zobrist hash of the board that `click` updates only for the changed columns (see `zobristColumnHash`). Use it as key for a `TranspositionTable`.
+
+	`features` are the `BoardFeatures` for heuristics, None until `getFeatures` is called. Once a state has them, `click` passes them on to the new states.
+
+	`columnColorHashes` and `colorHashes` are the hashes of each color per column and of the whole board that `getCanonicalKey` needs (see `colorColumnHashes` and `colorBoardHashes`). Like `features`, they are None until they are needed once and then updated by `click`.
+
+	For initiation, it demands a board in the one-line representation (see guidelines) as a string. Use `BoardState.fromBoard` to convert a `Board` or `BitBoard`.
+	'''
+
+	__slots__ = ('board', 'colors', 'score', 'moveList', 'origColumns', 'origRows', 'columnHashes', 'zobrist', 'features', 'columnColorHashes', 'colorHashes')
+
+	def __init__(self, grid=None):
+		'''
+		Initiating the board. See class description for details.
+		'''
+
+		self.features = None
+		self.columnColorHashes = None
+		self.colorHashes = None
+		if grid is not None:
+			self.setFromBoard(Board(grid))
+
+
+	@classmethod
+	def fromBoard(cls, board):
+		'''
+		Creates a state from a `Board`, `BitBoard` or `BoardState`. Score and moves are taken over.
+
+		:param board: The board to convert
+		:returns: A new `BoardState`
+		'''
+
+		state = cls()
+		state.setFromBoard(board)
+
+		return state
+
+
+	def setFromBoard(self, board):
+		'''
+		Sets all attributes from another board. Only used while creating a state.
+
+		:param board: The board to take the attributes from
+		'''
+
+		columns = []
+		for x in range(board.columns):
+			col = tuple([c for c in [board.getColor(x, y) for y in range(board.rows)] if c])
+			if col:
+				columns.append(col)
+		self.board = tuple(columns)
+		self.colors = dict(board.colors)
+		self.score = board.score
+		self.moveList = None
+		for move in board.moves:
+			self.moveList = (move, self.moveList)
+		self.origColumns = board.origColumns
+		self.origRows = board.origRows
+		self.columnHashes = tuple([zobristColumnHash(col) for col in self.board])
+		self.zobrist = zobristBoardHash(self.columnHashes)
+
+
+	@property
+	def columns(self):
+		return len(self.board)
+
+
+	@property
+	def rows(self):
+		return max([len(col) for col in self.board] or [0])
+
+
+	def getFeatures(self):
+		'''
+		Returns the `BoardFeatures` of the state. They are computed once and kept, and the states that `click` makes from this one get theirs from the change of the click.
+
+		:returns: The features
+		'''
+
+		if self.features is None:
+			self.features = BoardFeatures.fromState(self)
+
+		return self.features
+
+
+	def getCanonicalKey(self):
+		'''
+		Key for a `TranspositionTable` that is the same for all boards that only differ by the numbers of the colors. Such boards have the same moves and the same scores from here on, so a search only needs one of them. It is the same as renumbering the colors by their first appearance before hashing, but made from the sorted hashes of the colors, which `click` can update column by column.
+
+		:returns: The 64 bit key
+		'''
+
+		if self.colorHashes is None:
+			self.columnColorHashes = tuple([colorColumnHashes(col) for col in self.board])
+			self.colorHashes = colorBoardHashes(self.columnColorHashes)
+
+		h = 0
+		for colorHash in sorted([self.colorHashes[c] for c in self.colors if self.colors[c]]):
+			h = mix64(h ^ colorHash)
+
+		return h
+
+
+	@property
+	def moves(self):
+		'''
+		The moves as a list, like `Board.moves`. It is created from the linked list on each access.
+		'''
+
+		moves = []
+		node = self.moveList
+		while node is not None:
+			moves.append(node[0])
+			node = node[1]
+		moves.reverse()
+
+		return moves
+
+
+	__str__ = Board.__str__
+	calcScore = Board.calcScore
+	calcRemainingPoints = Board.calcRemainingPoints
+
+
+	def getColor(self, x, y):
+		'''
+		Returns the color of one element of the board (0 for an empty element).
+
+		:param x: The x-coordinate (column) of the element
+		:param y: The y-coordinate (row) of the element
+		:returns: The color of the element
+		'''
+
+		if x < len(self.board) and y < len(self.board[x]):
+			return self.board[x][y]
+
+		return 0
+
+
+	def floodFill(self, x, y):
+		'''
+		Returns all elements that belong to a field starting with a given coordinate. Uses the same algorithm as `Board.floodFill`.
+
+		:param x: The x-coordinate (column) of the element to start from
+		:param y: The y-coordinate (row) of the element to start from
+		:returns: A set of tuples with coordinates (x,y) that belong to the field
+		'''
+
+		b = self.board
+		color = self.getColor(x, y)
+		if not color:
+			return []
+		toChange = set()
+		toChange.add((x, y))
+		toFill = set()
+		toFill.add((x, y))
+		while toFill:
+			x, y = toFill.pop()
+
+			toChange.add((x, y))
+
+			if x > 0 and len(b[x-1]) > y and b[x-1][y] == color and (x-1, y) not in toChange:
+				toFill.add((x-1, y))
+
+			if x < len(b) - 1 and len(b[x+1]) > y and b[x+1][y] == color and (x+1, y) not in toChange:
+				toFill.add((x+1, y))
+
+			if y > 0 and b[x][y-1] == color and (x, y-1) not in toChange:
+				toFill.add((x, y-1))
+
+			if y < len(b[x]) - 1 and b[x][y+1] == color and (x, y+1) not in toChange:
+				toFill.add((x, y+1))
+
+		return toChange
+
+
+	def findAreas(self, withCells=True):
+		'''
+		Finds all clickable areas with more than one element in the board. They are read from the features, if the state has them.
+
+		:param withCells: If False, the areas are returned as `(x, y, size)` without the set of elements
+		'''
+
+		if self.features is not None:
+			return self.features.findAreas(withCells)
+
+		inArea = set()
+		areaEntries = []
+
+		for x, col in enumerate(self.board):
+			for y in range(len(col)):
+				if (x, y) not in inArea:
+					area = self.floodFill(x, y)
+					inArea.update(area)
+					if len(area) > 1:
+						if withCells:
+							areaEntries.append((x, y, len(area), area))
+						else:
+							areaEntries.append((x, y, len(area)))
+
+		return areaEntries
+
+
+	def click(self, x, y, toChange=None):
+		'''
+		Performs a "click" on a board element like `Board.click`, but returns the result as new state.
+		Does NOT change this state!
+
+		:param x: The x-coordinate (column) of the click
+		:param y: The y-coordinate (row) of the click
+		:param toChange: Optional set of the elements of the field (as returned by `floodFill`)
+		:returns: The new state or this state, if the click did not remove anything
+		'''
+
+		if toChange is None:
+			toChange = self.floodFill(x, y)
+		if len(toChange) < 2:
+			return self
+
+		removed = {}
+		for cx, cy in toChange:
+			if cx not in removed:
+				removed[cx] = set()
+			removed[cx].add(cy)
+
+		board = list(self.board)
+		color = board[cx][cy]
+		columnHashes = list(self.columnHashes)
+		zobrist = self.zobrist
+		vanished = False
+		for cx in removed:
+			ys = removed[cx]
+			board[cx] = tuple([c for i, c in enumerate(board[cx]) if i not in ys])
+			columnHashes[cx] = zobristColumnHash(board[cx])
+			zobrist ^= (self.columnHashes[cx] * zobristColumn(cx) ^ columnHashes[cx] * zobristColumn(cx)) & 0xFFFFFFFFFFFFFFFF
+			if not board[cx]:
+				vanished = True
+
+		new = BoardState()
+		if vanished:
+			# All columns right of a removed column move, so the hash is combined again from the column hashes
+			new.board = tuple([col for col in board if col])
+			new.columnHashes = tuple([h for h, col in zip(columnHashes, board) if col])
+			new.zobrist = zobristBoardHash(new.columnHashes)
+		else:
+			new.board = tuple(board)
+			new.columnHashes = tuple(columnHashes)
+			new.zobrist = zobrist
+		new.colors = dict(self.colors)
+		new.colors[color] -= len(toChange)
+		new.score = self.score + self.calcScore(len(toChange))
+		new.moveList = ((x, y), self.moveList)
+		new.origColumns = self.origColumns
+		new.origRows = self.origRows
+		if self.features is not None:
+			new.features = self.features.afterClick(self, new, removed)
+		if self.colorHashes is not None:
+			columnColorHashes = list(self.columnColorHashes)
+			colorHashes = dict(self.colorHashes)
+			for cx in removed:
+				old = columnColorHashes[cx]
+				columnColorHashes[cx] = colorColumnHashes(board[cx])
+				if not vanished:
+					for c in old:
+						colorHashes[c] ^= ((old[c] * zobristColumn(cx)) & 0xFFFFFFFFFFFFFFFF) ^ ((columnColorHashes[cx].get(c, 0) * zobristColumn(cx)) & 0xFFFFFFFFFFFFFFFF)
+			if vanished:
+				new.columnColorHashes = tuple([h for h, col in zip(columnColorHashes, board) if col])
+				new.colorHashes = colorBoardHashes(new.columnColorHashes)
+			else:
+				new.columnColorHashes = tuple(columnColorHashes)
+				new.colorHashes = colorHashes
+
+		return new
+
+
+class BoardFeatures():
+	'''
+	Features of a `BoardState` for heuristics, see `BoardState.getFeatures`:
+	- `colors`: the number of remaining elements per color (the dictionary of the state)
+	- `areas`: dictionary id -> `(x, y, size, cells)` of all clickable areas, like `findAreas` returns them
+	- `columnAreas`: tuple with a frozenset of the ids of the areas with elements in each column
+	- `sizes`: `collections.Counter` of the area sizes (size -> number of areas)
+	- `colorAreaCells`: dictionary color -> number of elements of the color in clickable areas
+	- `singletons`: the number of elements without neighbours of the same color
+
+	The features of a state are made once by flood filling the whole board (`fromState`). The features of the states that `click` makes from it are made from the features of the parent (`afterClick`): only the areas next to elements that moved are filled again, like in `AreaIndexBoard` (both use `clickRegion`, `moveCells` and `moveArea`). Areas are never changed, but replaced, so parent and children share all areas the click did not touch.
+	'''
+
+	__slots__ = ('colors', 'areas', 'columnAreas', 'sizes', 'colorAreaCells', 'singletons')
+
+	# Ids of the areas, unique across all states
+	ids = itertools.count(1)
+
+	def __init__(self, state, areas, columnAreas, sizes, colorAreaCells):
+		'''
+		Initiating the features. See class description for details.
+
+		:param state: The `BoardState` the features belong to
+		'''
+
+		self.colors = state.colors
+		self.areas = areas
+		self.columnAreas = columnAreas
+		self.sizes = sizes
+		self.colorAreaCells = colorAreaCells
+		self.singletons = sum(self.colors.values()) - sum(colorAreaCells.values())
+
+
+	@staticmethod
+	def labelAreas(state, cells, areas, columnAreas, sizes, colorAreaCells):
+		'''
+		Flood fills the given elements and adds the areas with more than one element. The elements must not be part of any area yet.
+
+		:param state: The `BoardState`
+		:param cells: Iterable of tuples with coordinates (x,y)
+		:param areas: Dictionary id -> `(x, y, size, cells)`. CHANGED IN PLACE!
+		:param columnAreas: List with a frozenset of area ids per column. CHANGED IN PLACE!
+		:param sizes: Counter of the area sizes. CHANGED IN PLACE!
+		:param colorAreaCells: Dictionary color -> elements in areas. CHANGED IN PLACE!
+		'''
+
+		b = state.board
+		seen = set()
+		for x, y in cells:
+			if (x, y) in seen:
+				continue
+			# Most elements have no neighbour of the same color, they do not need a flood fill
+			column = b[x]
+			color = column[y]
+			if not ((y > 0 and column[y-1] == color) or (y < len(column) - 1 and column[y+1] == color) or (x > 0 and len(b[x-1]) > y and b[x-1][y] == color) or (x < len(b) - 1 and len(b[x+1]) > y and b[x+1][y] == color)):
+				continue
+			area = state.floodFill(x, y)
+			seen.update(area)
+			if len(area) < 2:
+				continue
+			areaId = next(BoardFeatures.ids)
+			first = min(area)
+			areas[areaId] = (first[0], first[1], len(area), area)
+			for cx in set([cx for cx, cy in area]):
+				columnAreas[cx] = columnAreas[cx] | {areaId}
+			sizes[len(area)] += 1
+			color = state.board[x][y]
+			colorAreaCells[color] = colorAreaCells.get(color, 0) + len(area)
+
+
+	@classmethod
+	def fromState(cls, state):
+		'''
+		Computes the features of a state from scratch.
+
+		:param state: The `BoardState`
+		:returns: The features
+		'''
+
+		areas = {}
+		columnAreas = [frozenset()] * len(state.board)
+		sizes = collections.Counter()
+		colorAreaCells = {}
+		cls.labelAreas(state, [(x, y) for x, col in enumerate(state.board) for y in range(len(col))], areas, columnAreas, sizes, colorAreaCells)
+
+		return cls(state, areas, tuple(columnAreas), sizes, colorAreaCells)
+
+
+	def afterClick(self, parent, child, removed):
+		'''
+		Computes the features of a state that `click` made, from the features of its parent.
+
+		:param parent: The `BoardState` these features belong to
+		:param child: The new `BoardState`
+		:param removed: Dictionary column -> set of the rows of the removed elements (coordinates of the parent)
+		:returns: The features of the child
+		'''
+
+		columns = len(parent.board)
+		vanished = set([cx for cx in removed if len(removed[cx]) == len(parent.board[cx])])
+		lowestDirty, newX = clickRegion(removed, vanished, columns)
+
+		dirtyIds = set()
+		for nx, ny in lowestDirty.items():
+			for areaId in self.columnAreas[nx]:
+				if areaId not in dirtyIds:
+					for cx, cy in self.areas[areaId][3]:
+						if cx == nx and cy >= ny:
+							dirtyIds.add(areaId)
+							break
+
+		sizes = self.sizes.copy()
+		colorAreaCells = dict(self.colorAreaCells)
+		for areaId in dirtyIds:
+			x, y, size, area = self.areas[areaId]
+			sizes[size] -= 1
+			if not sizes[size]:
+				del sizes[size]
+			color = parent.board[x][y]
+			colorAreaCells[color] -= size
+			if not colorAreaCells[color]:
+				del colorAreaCells[color]
+
+		# The elements of the dirty region and of the dirty areas (in coordinates of the child)
+		cells = []
+		for nx, ny in lowestDirty.items():
+			if nx not in vanished:
+				cells.extend([(newX[nx], y) for y in range(ny, len(child.board[newX[nx]]))])
+		for areaId in dirtyIds:
+			cells.extend(moveCells(self.areas[areaId][3], removed, newX))
+
+		# Areas right of removed columns keep their shape, but move left
+		areas = dict(self.areas)
+		for areaId in dirtyIds:
+			del areas[areaId]
+		if vanished:
+			for cx in range(min(vanished) + 1, columns):
+				for areaId in self.columnAreas[cx]:
+					if areaId in areas and areas[areaId][0] == cx:
+						areas[areaId] = moveArea(areas[areaId], newX)
+		columnAreas = [ids - dirtyIds if ids & dirtyIds else ids for cx, ids in enumerate(self.columnAreas) if cx not in vanished]
+
+		self.labelAreas(child, cells, areas, columnAreas, sizes, colorAreaCells)
+
+		return BoardFeatures(child, areas, tuple(columnAreas), sizes, colorAreaCells)
+
+
+	def findAreas(self, withCells=True):
+		'''
+		Returns the clickable areas in the order of `BoardState.findAreas`.
+
+		:param withCells: If False, the areas are returned as `(x, y, size)` without the set of elements
+		'''
+
+		# No two areas share the first element
+		if withCells:
+			return sorted(self.areas.values())
+
+		return sorted([a[:3] for a in self.areas.values()])
+
+
+	def clearable(self, color):
+		'''
+		Estimates whether all elements of a color can still be removed: 1 if they are removed already, 0 if only one element is left, else the share of the elements that are in clickable areas right now.
+
+		:param color: The color
+		:returns: The estimate between 0 and 1
+		'''
+
+		count = self.colors.get(color, 0)
+		if not count:
+			return 1
+		if count == 1:
+			return 0
+
+		return self.colorAreaCells.get(color, 0) / count
+
+
+class TranspositionTable():
+	'''
+	A table of boards that a search has already seen, with a fixed size in memory. The boards are identified by a 64 bit key (like `BoardState.zobrist`). For each board it stores the number of moves it took to reach it (depth), the best score with which it was reached and the best move known from it. A search can try that move first when it meets the board again.
+
+	The entries are kept in flat arrays. Each key has exactly one slot (key modulo number of slots). If two keys want the same slot, `policy` decides:
+	- 'depth': the board with fewer moves is kept, as more of the search lies below it (for depth-first searches)
+	- 'score': the board with the higher score is kept
+	- 'always': the new board is kept (for breadth-first searches, where the new boards are the deepest ones)
+	'''
+
+	# Bytes per entry: key, score, depth, move
+	entryBytes = 8 + 8 + 2 + 4
+
+	def __init__(self, maxBytes=16 * 2**20, policy='depth'):
+		'''
+		Initiating the table. See class description for details.
+
+		:param maxBytes: The size of the table in bytes
+		:param policy: The replacement policy, see class description
+		'''
+
+		if policy not in ('depth', 'score', 'always'):
+			raise ValueError('Unknown replacement policy {}'.format(policy))
+
+		self.size = max(1, maxBytes // self.entryBytes)
+		self.policy = policy
+		self.keys = array.array('Q', [0]) * self.size
+		self.scores = array.array('q', [0]) * self.size
+		# depth + 1, so that 0 marks an empty slot
+		self.depths = array.array('H', [0]) * self.size
+		# x * 65536 + y, or -1 for no move
+		self.moves = array.array('i', [-1]) * self.size
+		self.hits = 0
+		self.misses = 0
+
+
+	def lookup(self, key):
+		'''
+		Looks up a board.
+
+		:param key: The key of the board
+		:returns: A tuple (depth, score, move) or None, if the board is not in the table. `move` is None if no move was stored.
+		'''
+
+		i = key % self.size
+		if not self.depths[i] or self.keys[i] != key:
+			self.misses += 1
+			return None
+
+		self.hits += 1
+		move = self.moves[i]
+
+		return self.depths[i] - 1, self.scores[i], None if move < 0 else divmod(move, 65536)
+
+
+	def store(self, key, depth, score, move=None):
+		'''
+		Stores a board. An entry of the same board is updated, if the new score is higher. An entry of another board is replaced according to the policy.
+
+		:param key: The key of the board
+		:param depth: The number of moves made to reach the board
+		:param score: The score with which the board was reached
+		:param move: The best move known from the board as (x, y), or None to keep the move of an entry of the same board
+		:returns: True, if the board was stored
+		'''
+
+		i = key % self.size
+		if self.depths[i]:
+			if self.keys[i] == key:
+				if score <= self.scores[i]:
+					return False
+			elif self.policy == 'depth' and depth + 1 > self.depths[i]:
+				return False
+			elif self.policy == 'score' and score < self.scores[i]:
+				return False
+
+		if move is not None:
+			self.moves[i] = move[0] * 65536 + move[1]
+		elif self.keys[i] != key:
+			self.moves[i] = -1
+		self.keys[i] = key
+		self.scores[i] = score
+		self.depths[i] = depth + 1
+
+		return True
+
+
+	def storeMove(self, key, move):
+		'''
+		Stores the best move known from a board that is in the table. Nothing is stored for other boards.
+
+		:param key: The key of the board
+		:param move: The move as (x, y)
+		'''
+
+		i = key % self.size
+		if self.depths[i] and self.keys[i] == key:
+			self.moves[i] = move[0] * 65536 + move[1]
+
+
+	def bestMove(self, key):
+		'''
+		Returns the best move known from a board. Unlike `lookup`, it is not counted as hit or miss.
+
+		:param key: The key of the board
+		:returns: The move as (x, y), or None if the board is not in the table or has no move
+		'''
+
+		i = key % self.size
+		if not self.depths[i] or self.keys[i] != key or self.moves[i] < 0:
+			return None
+
+		return divmod(self.moves[i], 65536)
+
+
+	def isNew(self, key, depth, score):
+		'''
+		Checks whether a board is worth searching: it is not in the table yet or only with a lower score. Then it is stored.
+
+		:param key: The key of the board
+		:param depth: The number of moves made to reach the board
+		:param score: The score with which the board was reached
+		:returns: True, if the board has to be searched
+		'''
+
+		entry = self.lookup(key)
+		if entry is not None and entry[1] >= score:
+			return False
+		self.store(key, depth, score)
+
+		return True
+
+
+class Trace():
+	'''
+	Output of the AIs, with a level of detail:
+	- 0: nothing (the default, so no time is spent on building strings)
+	- 1: progress, e.g. the best score after each layer of a search
+	- 2: additionally the board after each move, as frames separated by an empty line like play.html expects them
+	- 3: additionally debug information
+	The frames are collected and written in blocks of `bufferSize` characters instead of line by line. Lines of `info` are rare and written at once, together with the frames before them.
+	'''
+
+	def __init__(self, level=0, out=None, bufferSize=2**16):
+		'''
+		Initiating the trace.
+
+		:param level: The level of detail (see above)
+		:param out: The file to write to (None for `sys.stdout`)
+		:param bufferSize: Number of characters that are collected before writing
+		'''
+
+		self.level = level
+		self.out = out
+		self.bufferSize = bufferSize
+		self.buffer = []
+		self.size = 0
+
+
+	def write(self, s):
+		'''
+		Adds a string to the output.
+
+		:param s: The string
+		'''
+
+		self.buffer.append(s)
+		self.size += len(s)
+		if self.size >= self.bufferSize:
+			self.flush()
+
+
+	def info(self, *values, level=1):
+		'''
+		Writes a line like `print` does, if the level of the trace is at least `level`.
+
+		:param values: The values to write, separated by a space
+		:param level: The level of detail of the line
+		'''
+
+		if self.level >= level:
+			self.write(' '.join([str(v) for v in values]) + '\n')
+			self.flush()
+
+
+	def frame(self, move, board):
+		'''
+		Adds a frame with the next move and the board, if the level of the trace is at least 2. The board is only converted to a string in that case.
+
+		:param move: The next move as a string
+		:param board: The board before the move
+		'''
+
+		if self.level >= 2:
+			self.write('next move: ' + move + '\n' + str(board) + '\n')
+
+
+	def flush(self):
+		'''
+		Writes the collected output.
+		'''
+
+		if self.buffer:
+			out = self.out or sys.stdout
+			out.write(''.join(self.buffer))
+			out.flush()
+			self.buffer = []
+			self.size = 0
+
+
+class Profiler():
+	'''
+	Opt-in instrumentation of the engines. `enable` replaces the primitives `floodFill`, `findAreas`, `click` and `applyGravity` of all board classes, and `TranspositionTable.isNew`, by wrappers that count the calls and measure their time; `disable` puts the originals back. While it is not enabled, nothing is replaced, so there is no overhead. The times are inclusive, e.g. the time of `click` contains the time of the `applyGravity` it calls. A method that calls the same method of its base class (like `AreaIndexBoard.click`) is only counted once, for the class of the board.
+	Counters:
+	- `<Class>.<method>`: calls
+	- `<Class>.floodFill cells`: elements of the returned fields
+	- `<Class>.findAreas areas`: areas found
+	- `<Class>.applyGravity vanished columns`: columns removed by gravity
+	- `dedup hits` / `dedup misses`: boards `TranspositionTable.isNew` had seen before / not
+	- `peak frontier`: the largest layer of the BFS-like AIs (set through the module variable `profiler`)
+	'''
+
+	def __init__(self):
+		'''
+		Initiating the profiler. Nothing is measured until `enable` is called.
+		'''
+
+		self.counters = collections.Counter()
+		self.times = collections.Counter()
+		self.originals = []
+
+
+	def frontier(self, size):
+		'''
+		Reports the size of a layer of a search.
+
+		:param size: The number of boards in the layer
+		'''
+
+		if size > self.counters['peak frontier']:
+			self.counters['peak frontier'] = size
+
+
+	def wrap(self, cls, method, extra=None):
+		'''
+		Replaces a method of a class by a wrapper that counts and times the calls. Calls on boards of a subclass that has its own version of the method are not counted, as they come from that version, which is counted itself.
+
+		:param cls: The class
+		:param method: The name of the method
+		:param extra: Optional function `extra(counters, name, board, result, before)` that updates more counters, `before` being the number of columns of the board before the call
+		'''
+
+		original = cls.__dict__[method]
+		name = cls.__name__ + '.' + method
+		counters = self.counters
+		times = self.times
+
+		def wrapper(board, *args, **kwargs):
+			if getattr(type(board), method) is not wrapper:
+				return original(board, *args, **kwargs)
+			now = time.perf_counter()
+			if extra is None:
+				result = original(board, *args, **kwargs)
+			else:
+				before = getattr(board, 'columns', 0)
+				result = original(board, *args, **kwargs)
+				extra(counters, name, board, result, before)
+			times[name] += time.perf_counter() - now
+			counters[name] += 1
+			return result
+
+		self.originals.append((cls, method, original))
+		setattr(cls, method, wrapper)
+
+
+	def enable(self):
+		'''
+		Starts counting by replacing the primitives.
+		'''
+
+		def countCells(counters, name, board, result, before):
+			counters[name + ' cells'] += bitCount(result) if isinstance(result, int) else len(result)
+
+		def countAreas(counters, name, board, result, before):
+			counters[name + ' areas'] += len(result)
+
+		def countColumns(counters, name, board, result, before):
+			counters[name + ' vanished columns'] += before - board.columns
+
+		for cls in (Board, UnionFindBoard, BitBoard, AreaIndexBoard, BoardState):
+			for method, extra in (('floodFill', countCells), ('findAreas', countAreas), ('click', None), ('applyGravity', countColumns)):
+				# Inherited methods are wrapped in the base class
+				if method in cls.__dict__:
+					self.wrap(cls, method, extra)
+
+		counters = self.counters
+		isNew = TranspositionTable.isNew
+
+		def countDedup(table, *args, **kwargs):
+			result = isNew(table, *args, **kwargs)
+			counters['dedup misses' if result else 'dedup hits'] += 1
+			return result
+
+		self.originals.append((TranspositionTable, 'isNew', isNew))
+		TranspositionTable.isNew = countDedup
+
+
+	def disable(self):
+		'''
+		Stops counting by putting the original primitives back.
+		'''
+
+		for cls, method, original in reversed(self.originals):
+			setattr(cls, method, original)
+		self.originals = []
+
+
+	def report(self, out=sys.stderr):
+		'''
+		Writes the counters and times.
+
+		:param out: The file to write to
+		'''
+
+		for name in sorted(self.counters):
+			line = '{:<40} {:>12}'.format(name, self.counters[name])
+			if name in self.times:
+				line += ' {:>10.4f} s'.format(self.times[name])
+			print(line, file=out)
+
+
+# The active `Profiler` (see `--profile`), None if profiling is off
+profiler = None
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# #                                                                 # #
+# #                        AIs start here                           # #
+# #                                                                 # #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+def playShortsightedBestField(board, trace=None):
+	'''
+	AI. Simply clicks on the largest available field until no more clickable fields are available. Writes the field after each move to the trace. Finally, returns a string with moves.
+
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A string with all moves.
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	availableFields = board.findAreas()
+	trace.info(availableFields, level=3)
+	while availableFields:
+		# sort available fields by score, then taking the one with the uppermost entry point to not destroy structures above it; chose the best field
+		bestField = sorted(availableFields, key=lambda x: (x[2], x[1]))[-1]
+		trace.frame(str(bestField[0]) + ',' + str(bestField[1]), board)
+		# click the best field
+		board.click(bestField[0], bestField[1])
+		# update available fields
+		availableFields = board.findAreas()
+
+	trace.frame('No more moves', board)
+	board.score -= board.calcRemainingPoints()
+	trace.info('final score:', board.score)
+
+	return '[(' + '),('.join([str(x) + ',' + str(y) for x, y in board.moves]) + ')]'
+
+
+def playShortsightedWorstField(board, trace=None):
+	'''
+	AI. Simply clicks on the smallest available field until no more clickable field are available. Writes the field after each move to the trace. Finally, returns a string with moves.
+
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A string with all moves.
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	availableFields = board.findAreas()
+	while availableFields:
+		# sort available fields by score
+		worstField = sorted(availableFields, key=lambda x: x[2])[0]
+		trace.frame(str(worstField[0]) + ',' + str(worstField[1]), board)
+		# click the best field
+		board.click(worstField[0], worstField[1])
+		# update available fields
+		availableFields = board.findAreas()
+
+	trace.frame('No more moves', board)
+	board.score -= board.calcRemainingPoints()
+	trace.info('final score:', board.score)
+
+	return '[(' + '),('.join([str(x) + ',' + str(y) for x, y in board.moves]) + ')]'
+
+
+def playGraphBasedBasic(board, trace=None):
+	'''
+	AI. Attempt of an AI that makes a graph of all possible moves and traversing it via BFS-like (breadth-first-search).
+	The board is converted to a `BoardState`, so branches share all unchanged columns instead of being deep copies.
+
+	:param trace: The `Trace` for the output (None for no output)
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	bestBoard = BoardState.fromBoard(board)
+	newList = []
+	oldList = [bestBoard]
+
+	while oldList:
+		for b in oldList:
+			clickables = b.findAreas()
+			if not clickables:
+				if b.score > bestBoard.score:
+					bestBoard = b
+				continue
+			for c in clickables:
+				newList.append(b.click(c[0], c[1], c[3]))
+		oldList = newList
+		newList = []
+		trace.info(bestBoard.score, len(oldList))
+		if profiler is not None:
+			profiler.frontier(len(oldList))
+
+	return bestBoard.moves
+
+def playGraphBasedNoDoubleBoards(board, table=None, canonical=False, trace=None):
+	'''
+	AI. Attempt of an AI that makes a graph of all possible moves and traversing it via BFS-like (breadth-first-search). It consideres boards that occur twice and only uses the best of the two:
+	       .23    .2.
+	123 -> .23 -> .2. <,
+	123                +-- These two boards are equal but usually spaw new branches
+	    -> 12. -> .2. <'
+	       12.    .2.
+	The board is converted to a `BoardState`, so branches share all unchanged columns instead of being deep copies. The known boards are kept in a `TranspositionTable` keyed by the Zobrist hash of the states.
+
+	:param table: The `TranspositionTable` to use. A new one with policy 'always' is made, if None. Boards that do not fit into the table anymore may be searched twice. Do not use policy 'depth' here: every new board of a BFS is at least as deep as the stored ones, so a full table would not store any board anymore.
+	:param canonical: If True, boards that only differ by the numbers of the colors count as equal too (see `BoardState.getCanonicalKey`)
+	:param trace: The `Trace` for the output (None for no output)
+	'''
+
+	if table is None:
+		table = TranspositionTable(policy='always')
+	if trace is None:
+		trace = Trace()
+
+	bestBoard = BoardState.fromBoard(board)
+	bestScore = bestBoard.score - bestBoard.calcRemainingPoints()
+	if canonical:
+		bestBoard.getCanonicalKey()
+	newList = []
+	oldList = [bestBoard]
+	depth = 0
+
+	while oldList:
+		depth += 1
+		for b in oldList:
+			clickables = b.findAreas()
+			if not clickables:
+				finalScore = b.score - b.calcRemainingPoints()
+				if finalScore > bestScore:
+					bestBoard = b
+					bestScore = finalScore
+				continue
+			for c in clickables:
+				bNew = b.click(c[0], c[1], c[3])
+				if table.isNew(bNew.getCanonicalKey() if canonical else bNew.zobrist, depth, bNew.score):
+					newList.append(bNew)
+		oldList = newList
+		newList = []
+		trace.info(bestScore, len(oldList))
+		if profiler is not None:
+			profiler.frontier(len(oldList))
+
+	return bestBoard.moves
+
+
+def evaluateFinalScore(board):
+	'''
+	Heuristic for search AIs: the score the board would have, if no more moves were made. Higher is better.
+
+	:param board: The board to evaluate
+	:returns: The evaluation of the board
+	'''
+
+	return board.score - board.calcRemainingPoints()
+
+
+def evaluateAreas(board):
+	'''
+	Heuristic for search AIs: the score the board would have, if every clickable area was removed on its own and no more moves were made after that. Uses the `BoardFeatures` of the state, so the areas are not searched again for each board. Higher is better.
+
+	:param board: The `BoardState` to evaluate
+	:returns: The evaluation of the board
+	'''
+
+	features = board.getFeatures()
+	score = board.score + sum([(size - 1) ** 2 * count for size, count in features.sizes.items()])
+	for color, count in board.colors.items():
+		score -= board.calcScore(count - features.colorAreaCells.get(color, 0))
+
+	return score
+
+
+def playBeamSearch(board, width=100, heuristic=evaluateFinalScore, canonical=False, trace=None):
+	'''
+	AI. Searches the graph of moves layer by layer like `playGraphBasedNoDoubleBoards`, but only keeps the `width` best boards of each layer according to `heuristic`. Of boards that occur twice in a layer (same Zobrist hash) only the one with the higher score is kept. Time and memory are thus bounded by `width` times the number of clickable areas per layer.
+
+	:param width: The number of boards kept per layer
+	:param heuristic: Function that takes a board and returns a number; higher is better
+	:param canonical: If True, boards that only differ by the numbers of the colors count as equal too (see `BoardState.getCanonicalKey`)
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A list with all moves of the best board found.
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	bestBoard = BoardState.fromBoard(board)
+	bestScore = bestBoard.score - bestBoard.calcRemainingPoints()
+	if canonical:
+		bestBoard.getCanonicalKey()
+	oldList = [bestBoard]
+
+	while oldList:
+		knownBoards = {}
+		for b in oldList:
+			clickables = b.findAreas()
+			if not clickables:
+				finalScore = b.score - b.calcRemainingPoints()
+				if finalScore > bestScore:
+					bestBoard = b
+					bestScore = finalScore
+				continue
+			for c in clickables:
+				bNew = b.click(c[0], c[1], c[3])
+				key = bNew.getCanonicalKey() if canonical else bNew.zobrist
+				if key not in knownBoards or knownBoards[key].score < bNew.score:
+					knownBoards[key] = bNew
+		if profiler is not None:
+			profiler.frontier(len(knownBoards))
+		oldList = heapq.nlargest(width, knownBoards.values(), key=heuristic)
+		trace.info(bestScore, len(oldList))
+
+	return bestBoard.moves
+
+
+def rolloutBestField(board, budget=None):
+	'''
+	Rollout policy for search AIs. Plays like `playShortsightedBestField` (always the largest field, the uppermost one of equally large fields), but without any output.
+
+	:param board: The `BoardState` to start from
+	:param budget: Optional `SearchBudget`. When its time is up, the rollout stops and returns the board as it is, before the end of the game.
+	:returns: The final `BoardState`
+	'''
+
+	availableFields = board.findAreas()
+	while availableFields:
+		if budget is not None and budget.timeUp():
+			break
+		bestField = max(availableFields, key=lambda x: (x[2], x[1]))
+		board = board.click(bestField[0], bestField[1], bestField[3])
+		availableFields = board.findAreas()
+
+	return board
+
+
+def rolloutWorstField(board, budget=None):
+	'''
+	Rollout policy for search AIs. Plays like `playShortsightedWorstField` (always the smallest field), but without any output.
+
+	:param board: The `BoardState` to start from
+	:param budget: Optional `SearchBudget`. When its time is up, the rollout stops and returns the board as it is, before the end of the game.
+	:returns: The final `BoardState`
+	'''
+
+	availableFields = board.findAreas()
+	while availableFields:
+		if budget is not None and budget.timeUp():
+			break
+		worstField = min(availableFields, key=lambda x: x[2])
+		board = board.click(worstField[0], worstField[1], worstField[3])
+		availableFields = board.findAreas()
+
+	return board
+
+
+def rolloutRandom(board, budget=None, rng=random):
+	'''
+	Rollout policy for search AIs. Clicks random fields until no more moves are possible.
+
+	:param board: The `BoardState` to start from
+	:param budget: Optional `SearchBudget`. When its time is up, the rollout stops and returns the board as it is, before the end of the game.
+	:param rng: The random number generator to use (anything with a `choice` method)
+	:returns: The final `BoardState`
+	'''
+
+	availableFields = board.findAreas()
+	while availableFields:
+		if budget is not None and budget.timeUp():
+			break
+		field = rng.choice(availableFields)
+		board = board.click(field[0], field[1], field[3])
+		availableFields = board.findAreas()
+
+	return board
+
+
+class SearchBudget():
+	'''
+	Limits the work of a search AI by a number of iterations (e.g. rollouts), a wall-clock time in seconds, both or none. A limit of None means no limit.
+	'''
+
+	def __init__(self, iterations=None, timeLimit=None):
+		'''
+		Initiating the budget. The clock starts now.
+		'''
+
+		self.iterations = iterations
+		self.deadline = None if timeLimit is None else time.perf_counter() + timeLimit
+		self.used = 0
+
+
+	def spend(self):
+		'''
+		Counts one iteration.
+		'''
+
+		self.used += 1
+
+
+	def exhausted(self):
+		'''
+		:returns: True, if no iterations or no time are left
+		'''
+
+		if self.iterations is not None and self.used >= self.iterations:
+			return True
+
+		return self.timeUp()
+
+
+	def timeUp(self):
+		'''
+		:returns: True, if no time is left (the iterations are not checked)
+		'''
+
+		return self.deadline is not None and time.perf_counter() >= self.deadline
+
+
+def nestedSearch(board, level, rollout, budget):
+	'''
+	One level of the Nested Monte Carlo Search (see `playNestedMonteCarlo`).
+
+	:param board: The `BoardState` to start from
+	:param level: The nesting level; level 0 is a single rollout
+	:param rollout: The rollout policy
+	:param budget: The `SearchBudget`. If it is exhausted, the board is finished with a single rollout, which stops early when the time is up.
+	:returns: The best final `BoardState` found
+	'''
+
+	if level == 0 or budget.exhausted():
+		budget.spend()
+		return rollout(board, budget)
+
+	bestBoard = None
+	bestScore = None
+	while True:
+		# Out of budget: finish the board with one rollout instead of one per move
+		if budget.exhausted():
+			budget.spend()
+			result = rollout(board, budget)
+			if bestScore is None or result.score - result.calcRemainingPoints() > bestScore:
+				bestBoard = result
+			break
+		clickables = board.findAreas()
+		if not clickables:
+			break
+		for c in clickables:
+			if budget.exhausted():
+				break
+			result = nestedSearch(board.click(c[0], c[1], c[3]), level - 1, rollout, budget)
+			finalScore = result.score - result.calcRemainingPoints()
+			if bestScore is None or finalScore > bestScore:
+				bestBoard = result
+				bestScore = finalScore
+		if bestBoard is None:
+			continue
+		# Follow the best sequence found so far by one move
+		x, y = bestBoard.moves[len(board.moves)]
+		board = board.click(x, y)
+
+	if bestBoard is None:
+		return board
+
+	return bestBoard
+
+
+def playNestedMonteCarlo(board, level=2, rollout=rolloutBestField, iterations=None, timeLimit=None, trace=None):
+	'''
+	AI. Nested Monte Carlo Search: on level n, every possible move is evaluated with a search of level n-1, then the move of the best sequence found so far is made. Level 0 is one rollout with `rollout`. Once the budget is used up, every level finishes its current board with one rollout and returns, so the search gets better with a larger budget. The rollouts stop when the time is up, so a time limit is kept even on large boards; the moves may then end before the game does.
+
+	The start state computes its `BoardFeatures`, so the rollouts find the areas after each click without flood filling the whole board.
+
+	:param level: The nesting level
+	:param rollout: Function that takes a `BoardState` and a `SearchBudget` and returns the final `BoardState` after playing it to the end (or until the time is up)
+	:param iterations: Maximum number of rollouts (None for no limit)
+	:param timeLimit: Maximum time in seconds (None for no limit)
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A list with all moves of the best board found.
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	budget = SearchBudget(iterations, timeLimit)
+	start = BoardState.fromBoard(board)
+	start.getFeatures()
+	bestBoard = nestedSearch(start, level, rollout, budget)
+	trace.info(bestBoard.score - bestBoard.calcRemainingPoints(), budget.used)
+
+	return bestBoard.moves
+
+
+def playAnytime(board, timeLimit=None, heuristic=evaluateFinalScore, trace=None):
+	'''
+	AI. Anytime search with a wall-clock deadline: runs `playBeamSearch` again and again with doubling width (1, 2, 4, ...), which is iterative deepening on the width. From the start on, a full move sequence is known (the board played to the end with `rolloutBestField`), and after every layer the best board of the layer is played to the end the same way, so the best sequence gets better while the search runs. When the deadline is reached, the best sequence so far is returned; the rollouts stop at the deadline too, so on a large board this may be a sequence that ends before the game does. When a beam search did not have to drop any board, it was a complete search and the AI stops early. The start state computes its `BoardFeatures`, so no board is flood filled as a whole after a click.
+
+	:param timeLimit: Maximum time in seconds (None for no limit)
+	:param heuristic: Function that takes a board and returns a number; higher is better
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A list with all moves of the best board found.
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	budget = SearchBudget(timeLimit=timeLimit)
+	start = BoardState.fromBoard(board)
+	start.getFeatures()
+	bestBoard = rolloutBestField(start, budget)
+	bestScore = bestBoard.score - bestBoard.calcRemainingPoints()
+	trace.info(bestScore, 0)
+
+	width = 1
+	complete = False
+	while not complete and not budget.exhausted():
+		complete = True
+		oldList = [start]
+		while oldList and not budget.exhausted():
+			knownBoards = {}
+			for b in oldList:
+				if budget.exhausted():
+					break
+				clickables = b.findAreas()
+				if not clickables:
+					finalScore = b.score - b.calcRemainingPoints()
+					if finalScore > bestScore:
+						bestBoard = b
+						bestScore = finalScore
+					continue
+				for c in clickables:
+					# Large boards have thousands of moves, so the deadline is checked per move
+					if budget.exhausted():
+						break
+					bNew = b.click(c[0], c[1], c[3])
+					if bNew.zobrist not in knownBoards or knownBoards[bNew.zobrist].score < bNew.score:
+						knownBoards[bNew.zobrist] = bNew
+			if len(knownBoards) > width:
+				complete = False
+			if profiler is not None:
+				profiler.frontier(len(knownBoards))
+			oldList = heapq.nlargest(width, knownBoards.values(), key=heuristic)
+
+			# Pad the best partial sequence of this layer to a full one
+			if oldList:
+				b = rolloutBestField(oldList[0], budget)
+				finalScore = b.score - b.calcRemainingPoints()
+				if finalScore > bestScore:
+					bestBoard = b
+					bestScore = finalScore
+					trace.info(bestScore, width)
+		width *= 2
+
+	return bestBoard.moves
+
+
+def upperBound(board):
+	'''
+	Optimistic bound for search AIs: no final score reachable from the board is higher. It assumes that every color is removed with one click and nothing remains, as `(a - 1) ** 2 + (b - 1) ** 2` is never more than `(a + b - 1) ** 2`.
+
+	:param board: The board to evaluate
+	:returns: The bound
+	'''
+
+	return board.score + board.calcRemainingPoints()
+
+
+def playBranchAndBound(board, table=None, iterations=None, timeLimit=None, bound=upperBound, canonical=False, trace=None):
+	'''
+	AI. Depth-first branch and bound. The best board found so far starts as the result of `rolloutBestField`, which counts against the time limit and stops at it (then the moves may end before the game does). The moves of a board are searched from the largest to the smallest area (like `playShortsightedBestField`), and a board is not searched, if `bound` says that it cannot lead to a better score than the best board found so far. Boards that were already seen with at least the same score are skipped via the `TranspositionTable`. Whenever a better board is found, the table stores its moves as the best moves of the boards on its way, and a board that is searched again (reached with a higher score) tries its best move first. Without limits, the result is optimal, as long as `bound` never underestimates.
+
+	:param table: The `TranspositionTable` to use. A new one is made, if None.
+	:param iterations: Maximum number of boards to expand (None for no limit)
+	:param timeLimit: Maximum time in seconds (None for no limit)
+	:param bound: Function that takes a `BoardState` and returns an upper bound of the final scores reachable from it
+	:param canonical: If True, boards that only differ by the numbers of the colors count as equal too (see `BoardState.getCanonicalKey`)
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A list with all moves of the best board found.
+	'''
+
+	if table is None:
+		table = TranspositionTable()
+	if trace is None:
+		trace = Trace()
+
+	budget = SearchBudget(iterations, timeLimit)
+	start = BoardState.fromBoard(board)
+	if canonical:
+		start.getCanonicalKey()
+	# Only the rollout uses the features: the search clicks many boards it never expands, which would cost more than the flood fills it saves
+	greedy = BoardState.fromBoard(start)
+	greedy.getFeatures()
+	bestBoard = rolloutBestField(greedy, budget)
+	bestScore = evaluateFinalScore(bestBoard)
+	complete = True
+	trace.info(bestScore, 0)
+
+	def getKey(b):
+		return b.getCanonicalKey() if canonical else b.zobrist
+
+	def storeMoves(moves):
+		# Replays the moves from the start and stores each one as the best move of the board before it
+		b = start
+		for x, y in moves:
+			table.storeMove(getKey(b), (x, y))
+			b = b.click(x, y)
+
+	table.store(getKey(start), 0, start.score)
+	storeMoves(bestBoard.moves)
+
+	stack = [(start, 0)]
+	while stack:
+		b, depth = stack.pop()
+		# The best score may have improved since the board was put on the stack
+		if bound(b) <= bestScore:
+			continue
+		if budget.exhausted():
+			complete = False
+			break
+		budget.spend()
+
+		clickables = b.findAreas()
+		if not clickables:
+			finalScore = b.score - b.calcRemainingPoints()
+			if finalScore > bestScore:
+				bestBoard = b
+				bestScore = finalScore
+				trace.info(bestScore, budget.used)
+				storeMoves(b.moves)
+			continue
+		# The largest area is put on the stack last, so it is searched first, and the best move known from the table even before it
+		move = table.bestMove(getKey(b))
+		for c in sorted(clickables, key=lambda x: (move in x[3], x[2], x[1])):
+			bNew = b.click(c[0], c[1], c[3])
+			if bound(bNew) > bestScore and table.isNew(getKey(bNew), depth + 1, bNew.score):
+				stack.append((bNew, depth + 1))
+
+	trace.info('optimal' if complete else 'limit reached', bestScore, budget.used)
+
+	return bestBoard.moves
+
+
+def runPlayer(player, board, options, trace=None):
+	'''
+	Runs an AI by its name (see `players`) with the options from the command line.
+
+	:param player: The name of the AI
+	:param board: The board to play
+	:param options: Dictionary with the options `width`, `level`, `iterations`, `timeLimit`, `memoryLimit`, `heuristic` and `canonical` (missing options get the default values)
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: Whatever the AI returns
+	'''
+
+	if player == 'beam':
+		return playBeamSearch(board, options.get('width', 100), heuristics[options.get('heuristic', 'final')], options.get('canonical', False), trace=trace)
+	if player == 'bfsnodouble':
+		return playGraphBasedNoDoubleBoards(board, canonical=options.get('canonical', False), trace=trace)
+	if player == 'nmcs':
+		return playNestedMonteCarlo(board, options.get('level', 2), iterations=options.get('iterations'), timeLimit=options.get('timeLimit'), trace=trace)
+	if player == 'anytime':
+		return playAnytime(board, options.get('timeLimit'), heuristics[options.get('heuristic', 'final')], trace=trace)
+	if player == 'bnb':
+		return playBranchAndBound(board, iterations=options.get('iterations'), timeLimit=options.get('timeLimit'), canonical=options.get('canonical', False), trace=trace)
+	if player == 'bfsdisk':
+		return playGraphBasedSpilling(board, options.get('memoryLimit', 64 * 2**20), trace=trace)
+
+	return players[player](board, trace=trace)
+
+
+def solveSubtree(task):
+	'''
+	Worker of `playRootParallel`. Plays one board, that was sent as bytes, with an AI without output.
+
+	:param task: Tuple (serialized board, name of the AI, name of the engine, options)
+	:returns: Tuple (final score, list of moves)
+	'''
+
+	data, player, engine, options = task
+	board = deserializeBoard(data, engines[engine])
+	result = runPlayer(player, board, options)
+	# The shortsighted AIs return a string and leave the moves in the board
+	if isinstance(result, str):
+		moves = board.moves
+	else:
+		moves = list(result)
+
+	final = deserializeBoard(data, engines[engine])
+	for x, y in moves[len(final.moves):]:
+		final.click(x, y)
+
+	return final.score - final.calcRemainingPoints(), final.moves
+
+
+def playRootParallel(board, player='best', workers=None, engine='list', options={}, trace=None):
+	'''
+	AI. Makes every possible first move and plays each resulting board with another AI in a pool of processes. The boards are sent to the processes in the compact form of `serializeBoard`.
+
+	:param player: The name of the AI that plays the boards after the first move (see `players`)
+	:param workers: Number of processes (None for one per CPU)
+	:param engine: The name of the board class to use in the processes (see `engines`)
+	:param options: Options for the AI (see `runPlayer`)
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A list with all moves of the best board found.
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	tasks = []
+	for c in board.findAreas():
+		record = board.click(c[0], c[1], c[3], undoable=True)
+		tasks.append((serializeBoard(board), player, engine, options))
+		board.undo(record)
+
+	if not tasks:
+		return list(board.moves)
+
+	with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+		results = list(pool.map(solveSubtree, tasks))
+
+	bestScore, bestMoves = max(results, key=lambda r: r[0])
+	trace.info(bestScore, len(results))
+
+	# The serialized boards carry the moves made before, so `bestMoves` already starts with them
+	return bestMoves
+
+
+def frontierRecordSize(origColumns, origRows):
+	'''
+	Size in bytes of one board in a shared frontier (see `packFrontierBoard`).
+
+	:param origColumns: The original number of columns of the board
+	:param origRows: The original number of rows of the board
+	:returns: The size in bytes
+	'''
+
+	cells = origColumns * origRows
+
+	return 8 + 8 + 2 + cells + 2 * (cells // 2)
+
+
+def packFrontierBoard(buf, offset, state):
+	'''
+	Writes a `BoardState` into a shared frontier at `offset`: the Zobrist hash, the score, the number of moves, one byte per element (column by column, empty elements are 0) and two bytes per move. All records of a board have the same size, so that a frontier can be sliced by index.
+
+	:param buf: The buffer of the shared memory
+	:param offset: The position of the record in bytes
+	:param state: The state to write
+	'''
+
+	moves = state.moves
+	struct.pack_into('<QqH', buf, offset, state.zobrist, state.score, len(moves))
+	offset += 18
+	cells = bytearray(state.origColumns * state.origRows)
+	for x, column in enumerate(state.board):
+		cells[x * state.origRows:x * state.origRows + len(column)] = bytes(column)
+	buf[offset:offset + len(cells)] = cells
+	offset += len(cells)
+	buf[offset:offset + 2 * len(moves)] = bytes([a for move in moves for a in move])
+
+
+def unpackFrontierBoard(buf, offset, origColumns, origRows):
+	'''
+	Reads a board written by `packFrontierBoard`.
+
+	:param buf: The buffer of the shared memory
+	:param offset: The position of the record in bytes
+	:param origColumns: The original number of columns of the board
+	:param origRows: The original number of rows of the board
+	:returns: The `BoardState`
+	'''
+
+	zobrist, score, numOfMoves = struct.unpack_from('<QqH', buf, offset)
+	offset += 18
+	cells = bytes(buf[offset:offset + origColumns * origRows])
+	offset += origColumns * origRows
+	moves = bytes(buf[offset:offset + 2 * numOfMoves])
+
+	state = BoardState()
+	columns = []
+	colors = {}
+	for x in range(origColumns):
+		column = tuple([c for c in cells[x * origRows:(x + 1) * origRows] if c])
+		if column:
+			columns.append(column)
+			for c in column:
+				colors[c] = colors.get(c, 0) + 1
+	state.board = tuple(columns)
+	state.colors = colors
+	state.score = score
+	state.moveList = None
+	for i in range(numOfMoves):
+		state.moveList = ((moves[2 * i], moves[2 * i + 1]), state.moveList)
+	state.origColumns = origColumns
+	state.origRows = origRows
+	state.columnHashes = tuple([zobristColumnHash(col) for col in state.board])
+	state.zobrist = zobrist
+
+	return state
+
+
+def writeFrontier(name, states, recordSize):
+	'''
+	Creates a shared memory block with the given name and writes the states into it.
+
+	:param name: The name of the shared memory block
+	:param states: List of `BoardState`
+	:param recordSize: The size of one record (see `frontierRecordSize`)
+	:returns: The shared memory block. The caller has to close it.
+	'''
+
+	block = multiprocessing.shared_memory.SharedMemory(name=name, create=True, size=max(1, len(states) * recordSize))
+	for i, state in enumerate(states):
+		packFrontierBoard(block.buf, i * recordSize, state)
+
+	return block
+
+
+def readFrontier(name, count, origColumns, origRows):
+	'''
+	Reads all states of a shared memory block written by `writeFrontier`.
+
+	:param name: The name of the shared memory block
+	:param count: The number of states in the block
+	:param origColumns: The original number of columns of the board
+	:param origRows: The original number of rows of the board
+	:returns: List of `BoardState`
+	'''
+
+	recordSize = frontierRecordSize(origColumns, origRows)
+	block = multiprocessing.shared_memory.SharedMemory(name=name)
+	states = [unpackFrontierBoard(block.buf, i * recordSize, origColumns, origRows) for i in range(count)]
+	block.close()
+
+	return states
+
+
+def layerWorker(index, workers, origColumns, origRows, tasks, results):
+	'''
+	Worker process of `playGraphBasedParallel`. Takes tasks from the queue `tasks` until it gets None and puts one result per task into `results`:
+	- ('expand', layer, block, count): expands all boards of a frontier block. The children are written to one new block per worker, chosen by the Zobrist hash of the child (the worker with index `hash % workers` owns it). Result: ('expand', index, counts per owner, best final score, its moves)
+	- ('dedup', layer, blocks): reads the children owned by this worker from the given (name, count) blocks and keeps the ones that were not seen before, or only with a lower score. The known boards of the whole search are kept in this process. Result: ('dedup', index, name of the new frontier block, count)
+
+	If a task raises an exception, the result is ('error', index, formatted traceback).
+	'''
+
+	recordSize = frontierRecordSize(origColumns, origRows)
+	knownBoardsScore = {}
+
+	for task in iter(tasks.get, None):
+		try:
+			runLayerTask(task, index, workers, origColumns, origRows, recordSize, knownBoardsScore, results)
+		except Exception:
+			results.put(('error', index, traceback.format_exc()))
+
+
+def runLayerTask(task, index, workers, origColumns, origRows, recordSize, knownBoardsScore, results):
+	'''
+	Runs one task of `layerWorker` and puts its result into `results`.
+
+	:param task: The task (see `layerWorker`)
+	:param index: The index of the worker
+	:param workers: The number of workers
+	:param origColumns: The original number of columns of the board
+	:param origRows: The original number of rows of the board
+	:param recordSize: The size of one record (see `frontierRecordSize`)
+	:param knownBoardsScore: Dictionary of the hashes and scores of the known boards owned by this worker
+	:param results: The queue of the results
+	'''
+
+	if task[0] == 'expand':
+		layer, name, count = task[1:]
+		owned = [[] for i in range(workers)]
+		bestScore = None
+		bestMoves = None
+		for b in readFrontier(name, count, origColumns, origRows):
+			clickables = b.findAreas()
+			if not clickables:
+				finalScore = b.score - b.calcRemainingPoints()
+				if bestScore is None or finalScore > bestScore:
+					bestScore = finalScore
+					bestMoves = b.moves
+				continue
+			for c in clickables:
+				bNew = b.click(c[0], c[1], c[3])
+				owned[bNew.zobrist % workers].append(bNew)
+		for owner in range(workers):
+			writeFrontier('{}_{}_{}'.format(name, index, owner), owned[owner], recordSize).close()
+		results.put(('expand', index, [len(o) for o in owned], bestScore, bestMoves))
+
+	elif task[0] == 'dedup':
+		layer, prefix, blocks = task[1:]
+		# Only the headers are read, the records are copied as they are
+		survivors = {}
+		for name, count in blocks:
+			block = multiprocessing.shared_memory.SharedMemory(name=name)
+			for i in range(count):
+				zobrist, score = struct.unpack_from('<Qq', block.buf, i * recordSize)
+				if zobrist not in knownBoardsScore or knownBoardsScore[zobrist] < score:
+					knownBoardsScore[zobrist] = score
+					survivors[zobrist] = bytes(block.buf[i * recordSize:(i + 1) * recordSize])
+			block.close()
+		name = '{}_{}'.format(prefix, index)
+		block = multiprocessing.shared_memory.SharedMemory(name=name, create=True, size=max(1, len(survivors) * recordSize))
+		for i, record in enumerate(survivors.values()):
+			block.buf[i * recordSize:(i + 1) * recordSize] = record
+		block.close()
+		results.put(('dedup', index, name, len(survivors)))
+
+
+def unlinkFrontier(name):
+	'''
+	Removes a shared memory block.
+
+	:param name: The name of the shared memory block
+	'''
+
+	block = multiprocessing.shared_memory.SharedMemory(name=name)
+	block.close()
+	block.unlink()
+
+
+def getLayerResult(results, processes):
+	'''
+	Waits for the next result of the workers of `playGraphBasedParallel`. The workers are checked once per second, so that a worker that died does not make the search wait forever.
+
+	:param results: The queue of the results
+	:param processes: The worker processes
+	:returns: The result (see `layerWorker`)
+	'''
+
+	while True:
+		try:
+			result = results.get(timeout=1)
+		except queue.Empty:
+			for p in processes:
+				if not p.is_alive():
+					raise RuntimeError('Worker process {} of the parallel search exited with code {}'.format(p.name, p.exitcode))
+			continue
+		if result[0] == 'error':
+			raise RuntimeError('Worker {} of the parallel search failed:\n{}'.format(result[1], result[2]))
+		return result
+
+
+def playGraphBasedParallel(board, workers=None, trace=None):
+	'''
+	AI. Same search as `playGraphBasedNoDoubleBoards`, but each layer is expanded by several processes. The frontier of a layer lies in shared memory blocks of packed boards (see `packFrontierBoard`), one block per worker. Every worker expands its own block, and sends each child to the worker that owns its Zobrist hash (hash modulo number of workers). The owner removes double boards of its hash range and writes the next frontier block. As every board has exactly one owner, no process has to know all boards.
+
+	:param workers: Number of processes (None for one per CPU)
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A list with all moves of the best board found.
+	'''
+
+	if workers is None:
+		workers = os.cpu_count() or 1
+	if trace is None:
+		trace = Trace()
+
+	start = BoardState.fromBoard(board)
+	origColumns, origRows = start.origColumns, start.origRows
+	if origColumns > 255 or origRows > 255 or (start.colors and max(start.colors) > 255):
+		raise ValueError('Boards for the parallel search must not be larger than 255 x 255 and have colors up to 255')
+
+	prefix = 'samegame_{}'.format(os.getpid())
+	bestScore = start.score - start.calcRemainingPoints()
+	bestMoves = start.moves
+	layer = 0
+	name = '{}_{}_0'.format(prefix, layer)
+	writeFrontier(name, [start], frontierRecordSize(origColumns, origRows)).close()
+	frontier = [(name, 1)] + [None] * (workers - 1)
+
+	# The first block is created before the workers start, so that they share the resource tracker of this process
+	tasks = [multiprocessing.Queue() for i in range(workers)]
+	results = multiprocessing.Queue()
+	processes = [multiprocessing.Process(target=layerWorker, args=(i, workers, origColumns, origRows, tasks[i], results)) for i in range(workers)]
+	for p in processes:
+		p.start()
+
+	try:
+		while any(frontier):
+			# Expand: every worker expands its own block
+			expanding = [i for i in range(workers) if frontier[i]]
+			for i in expanding:
+				tasks[i].put(('expand', layer, frontier[i][0], frontier[i][1]))
+			counts = {}
+			for i in expanding:
+				result = getLayerResult(results, processes)
+				counts[result[1]] = result[2]
+				if result[3] is not None and result[3] > bestScore:
+					bestScore = result[3]
+					bestMoves = result[4]
+
+			# Remove double boards: every worker gets the children it owns
+			layer += 1
+			newPrefix = '{}_{}'.format(prefix, layer)
+			for owner in range(workers):
+				blocks = [('{}_{}_{}'.format(frontier[i][0], i, owner), counts[i][owner]) for i in expanding]
+				tasks[owner].put(('dedup', layer, newPrefix, blocks))
+			newFrontier = [None] * workers
+			for owner in range(workers):
+				result = getLayerResult(results, processes)
+				newFrontier[result[1]] = (result[2], result[3]) if result[3] else None
+				if not result[3]:
+					unlinkFrontier(result[2])
+
+			for i in expanding:
+				unlinkFrontier(frontier[i][0])
+				for owner in range(workers):
+					unlinkFrontier('{}_{}_{}'.format(frontier[i][0], i, owner))
+			frontier = newFrontier
+			trace.info(bestScore, sum([f[1] for f in frontier if f]))
+			if profiler is not None:
+				profiler.frontier(sum([f[1] for f in frontier if f]))
+	except BaseException:
+		# The other workers may still be busy with a task
+		for p in processes:
+			p.terminate()
+			p.join()
+		names = ['{}_{}_{}'.format(prefix, layer, owner) for owner in range(workers)]
+		for i in range(workers):
+			if frontier[i]:
+				names += [frontier[i][0]] + ['{}_{}_{}'.format(frontier[i][0], i, owner) for owner in range(workers)]
+		for name in names:
+			with contextlib.suppress(FileNotFoundError):
+				unlinkFrontier(name)
+		raise
+	finally:
+		for i in range(workers):
+			tasks[i].put(None)
+		for p in processes:
+			p.join()
+
+	return bestMoves
+
+
+def frontierRecordKey(record):
+	'''
+	Sort key of a packed board (see `packFrontierBoard`): the Zobrist hash and then the best score first.
+
+	:param record: The record as bytes
+	:returns: Tuple (hash, negative score)
+	'''
+
+	zobrist, score = struct.unpack_from('<Qq', record)
+
+	return zobrist, -score
+
+
+class FrontierStore():
+	'''
+	The frontier of a BFS that does not have to fit into memory. The boards of the next layer are added as packed records (see `packFrontierBoard`) to a buffer. When the buffer reaches `memoryLimit` bytes, it is sorted by Zobrist hash and written to a temporary file (a run). `nextLayer` merges all runs and drops the boards that were seen before with at least the same score. The hashes and scores of all boards ever seen are kept in another sorted temporary file, so that this is a single pass of an external merge. The files are memory-mapped for reading.
+
+	Only the buffer and one record per run are held in memory, the rest is on disk. To bound the number of open files, runs are merged in passes: whenever `maxRuns` runs of the same level exist, they are merged into one run of the next level, and `nextLayer` merges the newest runs until at most `maxRuns` are left.
+	'''
+
+	# Maximum number of runs that are merged at once (each one is open and memory-mapped while merging)
+	maxRuns = 16
+
+	def __init__(self, origColumns, origRows, memoryLimit=64 * 2**20, directory=None):
+		'''
+		Initiating the store. See class description for details.
+
+		:param origColumns: The original number of columns of the boards
+		:param origRows: The original number of rows of the boards
+		:param memoryLimit: The size of the buffer in bytes
+		:param directory: The directory of the temporary files (None for the default of `tempfile`)
+		'''
+
+		self.origColumns = origColumns
+		self.origRows = origRows
+		self.recordSize = frontierRecordSize(origColumns, origRows)
+		self.memoryLimit = max(memoryLimit, self.recordSize)
+		self.directory = directory
+		self.emptyRecord = bytes(self.recordSize)
+		self.buffer = bytearray()
+		# Tuples (level, file) of the sorted runs; a run of level n is the merge of `maxRuns` runs of level n - 1
+		self.runs = []
+		# The current layer (records) and the known boards (hash and score), both sorted by hash
+		self.layer = None
+		self.count = 0
+		self.known = None
+		self.hits = 0
+		self.misses = 0
+
+
+	def add(self, state):
+		'''
+		Adds a board to the next layer.
+
+		:param state: The `BoardState` to add
+		'''
+
+		offset = len(self.buffer)
+		self.buffer += self.emptyRecord
+		packFrontierBoard(self.buffer, offset, state)
+		if len(self.buffer) >= self.memoryLimit:
+			self.spill()
+
+
+	def sortBuffer(self):
+		'''
+		Sorts the records of the buffer and empties it. Of several records of the same board, only the best is kept.
+
+		:returns: List of records, sorted by `frontierRecordKey`
+		'''
+
+		size = self.recordSize
+		records = sorted([bytes(self.buffer[i:i + size]) for i in range(0, len(self.buffer), size)], key=frontierRecordKey)
+		self.buffer = bytearray()
+
+		result = []
+		last = None
+		for record in records:
+			if record[:8] != last:
+				result.append(record)
+				last = record[:8]
+
+		return result
+
+
+	def spill(self):
+		'''
+		Writes the buffer as sorted run to a temporary file.
+		'''
+
+		f = tempfile.TemporaryFile(dir=self.directory)
+		for record in self.sortBuffer():
+			f.write(record)
+		f.flush()
+		self.runs.append((0, f))
+		while len(self.runs) >= self.maxRuns and all(level == self.runs[-1][0] for level, _ in self.runs[-self.maxRuns:]):
+			self.mergeNewestRuns()
+
+
+	def mergeNewestRuns(self):
+		'''
+		Replaces the newest `maxRuns` runs by their merge, one level higher than the highest of them.
+		'''
+
+		runs = self.runs[-self.maxRuns:]
+		del self.runs[-self.maxRuns:]
+		self.runs.append((max(level for level, _ in runs) + 1, self.mergeRuns([f for _, f in runs])))
+
+
+	def mergeRuns(self, runs):
+		'''
+		Merges sorted runs into one. Of several records of the same board, only the best is kept. The runs are closed.
+
+		:param runs: List of temporary files
+		:returns: The temporary file of the merged run
+		'''
+
+		f = tempfile.TemporaryFile(dir=self.directory)
+		last = None
+		for record in heapq.merge(*[self.readFile(run, self.recordSize) for run in runs], key=frontierRecordKey):
+			if record[:8] != last:
+				f.write(record)
+				last = record[:8]
+		f.flush()
+		for run in runs:
+			run.close()
+
+		return f
+
+
+	def readFile(self, f, size):
+		'''
+		Reads the records of a temporary file via `mmap`.
+
+		:param f: The file
+		:param size: The size of a record
+		:returns: Generator of records
+		'''
+
+		f.flush()
+		if not os.fstat(f.fileno()).st_size:
+			return
+		with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+			for offset in range(0, len(m), size):
+				yield m[offset:offset + size]
+
+
+	def readKnown(self):
+		'''
+		Reads the known boards.
+
+		:returns: Generator of tuples (hash, score), sorted by hash
+		'''
+
+		if self.known is None:
+			return
+		for record in self.readFile(self.known, 16):
+			yield struct.unpack('<Qq', record)
+
+
+	def nextLayer(self):
+		'''
+		Finishes the layer that was added: merges the runs and the buffer, drops double boards and boards that were already known with at least the same score, and makes the rest the current layer.
+
+		:returns: The number of boards in the new current layer
+		'''
+
+		while len(self.runs) > self.maxRuns:
+			self.mergeNewestRuns()
+		runs = [self.readFile(f, self.recordSize) for _, f in self.runs]
+		runs.append(iter(self.sortBuffer()))
+		layer = tempfile.TemporaryFile(dir=self.directory)
+		known = tempfile.TemporaryFile(dir=self.directory)
+		oldKnown = self.readKnown()
+		entry = next(oldKnown, None)
+		count = 0
+		hits = 0
+		last = None
+
+		for record in heapq.merge(*runs, key=frontierRecordKey):
+			zobrist, score = struct.unpack_from('<Qq', record)
+			if zobrist == last:
+				hits += 1
+				continue
+			last = zobrist
+			while entry is not None and entry[0] < zobrist:
+				known.write(struct.pack('<Qq', *entry))
+				entry = next(oldKnown, None)
+			if entry is not None and entry[0] == zobrist:
+				if entry[1] >= score:
+					hits += 1
+					continue
+				entry = next(oldKnown, None)
+			known.write(struct.pack('<Qq', zobrist, score))
+			layer.write(record)
+			count += 1
+		while entry is not None:
+			known.write(struct.pack('<Qq', *entry))
+			entry = next(oldKnown, None)
+
+		for f in [f for _, f in self.runs] + [self.layer, self.known]:
+			if f is not None:
+				f.close()
+		self.runs = []
+		self.layer = layer
+		self.known = known
+		self.count = count
+		self.hits += hits
+		self.misses += count
+		if profiler is not None:
+			profiler.counters['dedup hits'] += hits
+			profiler.counters['dedup misses'] += count
+
+		return count
+
+
+	def __iter__(self):
+		'''
+		Iterates over the boards of the current layer.
+
+		:returns: Generator of `BoardState`
+		'''
+
+		if self.layer is None:
+			return
+		for record in self.readFile(self.layer, self.recordSize):
+			yield unpackFrontierBoard(record, 0, self.origColumns, self.origRows)
+
+
+	def close(self):
+		'''
+		Removes all temporary files.
+		'''
+
+		for f in [f for _, f in self.runs] + [self.layer, self.known]:
+			if f is not None:
+				f.close()
+		self.runs = []
+		self.layer = None
+		self.known = None
+		self.buffer = bytearray()
+
+
+def playGraphBasedSpilling(board, memoryLimit=64 * 2**20, directory=None, trace=None):
+	'''
+	AI. Same search as `playGraphBasedNoDoubleBoards`, but the frontier and the known boards are kept in a `FrontierStore`, that spills to temporary files. So the search only needs about `memoryLimit` bytes, no matter how many boards there are, and no board is searched twice because a table was full.
+
+	:param memoryLimit: The size of the buffer of the `FrontierStore` in bytes
+	:param directory: The directory of the temporary files (None for the default of `tempfile`)
+	:param trace: The `Trace` for the output (None for no output)
+	:returns: A list with all moves of the best board found.
+	'''
+
+	if trace is None:
+		trace = Trace()
+
+	start = BoardState.fromBoard(board)
+	if start.origColumns > 255 or start.origRows > 255 or (start.colors and max(start.colors) > 255):
+		raise ValueError('Boards for the spilling search must not be larger than 255 x 255 and have colors up to 255')
+
+	bestScore = start.score - start.calcRemainingPoints()
+	bestMoves = start.moves
+	store = FrontierStore(start.origColumns, start.origRows, memoryLimit, directory)
+	try:
+		store.add(start)
+		store.nextLayer()
+		while store.count:
+			for b in store:
+				clickables = b.findAreas()
+				if not clickables:
+					finalScore = b.score - b.calcRemainingPoints()
+					if finalScore > bestScore:
+						bestScore = finalScore
+						bestMoves = b.moves
+					continue
+				for c in clickables:
+					store.add(b.click(c[0], c[1], c[3]))
+			store.nextLayer()
+			trace.info(bestScore, store.count)
+			if profiler is not None:
+				profiler.frontier(store.count)
+	finally:
+		store.close()
+
+	return bestMoves
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# #                                                                 # #
+# #                Helper functions start here                      # #
+# #                                                                 # #
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+def runSequence(board, sequence, trace=None):
+	'''
+	Applies a given sequence on a given board.
+
+	:param board: Board object on which to apply the sequence
+	:param sequence: List of tuples with coordinates of fields to click
+	:param trace: The `Trace` for the frames (None to write them to stdout)
+	'''
+
+	if trace is None:
+		trace = Trace(2)
+
+	for c in sequence:
+		trace.frame(str(c[0]) + ',' + str(c[1]), board)
+		board.click(c[0], c[1])
+
+	trace.frame('No more moves', board)
+	trace.info('final score:', board.score - board.calcRemainingPoints())
+	trace.flush()
+
+
+def clickRegion(removed, vanished, columns):
+	'''
+	The part of the incremental area indexes (`AreaIndexBoard` and `BoardFeatures`) that does not depend on how they store the areas. Elements that move are the ones above the lowest removed element of a column. Their areas and the areas next to them have to be filled again.
+
+	:param removed: Dictionary column -> set of the rows of the removed elements
+	:param vanished: The columns that are empty after the click
+	:param columns: The number of columns before the click
+	:returns: Tuple (dictionary column -> lowest row of the elements whose areas have to be filled again; list with the new column of each column)
+	'''
+
+	lowestDirty = {}
+	for cx in removed:
+		lowest = min(removed[cx])
+		for nx, ny in ((cx - 1, lowest), (cx, max(lowest - 1, 0)), (cx + 1, lowest)):
+			if 0 <= nx < columns:
+				lowestDirty[nx] = min(lowestDirty.get(nx, ny), ny)
+
+	newX = []
+	shift = 0
+	for cx in range(columns):
+		if cx in vanished:
+			shift += 1
+		newX.append(cx - shift)
+
+	return lowestDirty, newX
+
+
+def moveCells(cells, removed, newX):
+	'''
+	Computes where elements are after a click. Removed elements are left out.
+
+	:param cells: Iterable of tuples with coordinates (x,y) before the click
+	:param removed: Dictionary column -> set of the rows of the removed elements
+	:param newX: The new column of each column (see `clickRegion`)
+	:returns: List of tuples with coordinates (x,y) after the click
+	'''
+
+	moved = []
+	for cx, cy in cells:
+		if cx in removed:
+			if cy in removed[cx]:
+				continue
+			cy -= len([ry for ry in removed[cx] if ry < cy])
+		moved.append((newX[cx], cy))
+
+	return moved
+
+
+def moveArea(area, newX):
+	'''
+	Moves an area that keeps its shape after a click, because it lies right of the removed columns, to the left.
+
+	:param area: Tuple `(x, y, size, cells)` like `findAreas` returns it
+	:param newX: The new column of each column (see `clickRegion`)
+	:returns: The moved area
+	'''
+
+	fx, fy, size, cells = area
+	shift = fx - newX[fx]
+
+	return (fx - shift, fy, size, set([(cx - shift, cy) for cx, cy in cells]))
+
+
+def bitCount(n):
+	'''
+	Counts the set bits of an integer (the number of elements in a bit mask of `BitBoard`).
+
+	:param n: A non-negative integer
+	:returns: The number of set bits
+	'''
+
+	return bin(n).count('1')
+
+
+# Python 3.10 and newer can count bits without building a string
+if hasattr(int, 'bit_count'):
+	bitCount = int.bit_count
+
+
+def bitPositions(n):
+	'''
+	Lists the positions of all set bits of an integer, starting with the lowest one.
+
+	:param n: A non-negative integer
+	:returns: A list with the positions of the set bits
+	'''
+
+	bits = bin(n)[:1:-1]
+	positions = []
+	i = bits.find('1')
+	while i >= 0:
+		positions.append(i)
+		i = bits.find('1', i + 1)
+
+	return positions
+
+
+def mix64(n):
+	'''
+	Scrambles an integer into a 64 bit number that looks random (the finalizer of SplitMix64). The same input always gives the same output, also in other processes.
+
+	:param n: A non-negative integer
+	:returns: The scrambled 64 bit number
+	'''
+
+	n = (n + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+	n = ((n ^ (n >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+	n = ((n ^ (n >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+
+	return n ^ (n >> 31)
+
+
+# Random numbers of the Zobrist hashes of `BoardState` (one per row and color and one per column), created on demand
+zobristElements = {}
+zobristColumns = []
+zobristRows = []
+
+
+def zobristColumnHash(column):
+	'''
+	Zobrist hash of one column of a `BoardState`: the XOR of one random number per element, chosen by its row and color.
+
+	:param column: Tuple of colors from bottom to top
+	:returns: The 64 bit hash of the column
+	'''
+
+	h = 0
+	for y, color in enumerate(column):
+		key = (y << 16) | color
+		if key not in zobristElements:
+			zobristElements[key] = mix64(key)
+		h ^= zobristElements[key]
+
+	return h
+
+
+def zobristColumn(x):
+	'''
+	Random odd 64 bit number of column x. A column hash is multiplied with it, so that equal columns at different places give different board hashes.
+
+	:param x: The x-coordinate of the column
+	:returns: The random number
+	'''
+
+	while len(zobristColumns) <= x:
+		zobristColumns.append(mix64(len(zobristColumns) + (1 << 40)) | 1)
+
+	return zobristColumns[x]
+
+
+def zobristRow(y):
+	'''
+	Random 64 bit number of row y for the color-independent hashes of `BoardState.getCanonicalKey`.
+
+	:param y: The y-coordinate of the row
+	:returns: The random number
+	'''
+
+	while len(zobristRows) <= y:
+		zobristRows.append(mix64(len(zobristRows) + (2 << 40)))
+
+	return zobristRows[y]
+
+
+def colorColumnHashes(column):
+	'''
+	Hashes of the elements of each color in one column, each the XOR of the random numbers of their rows. Unlike `zobristColumnHash`, the hash of a color does not depend on its number, so renumbering the colors only swaps the hashes.
+
+	:param column: Tuple of colors from bottom to top
+	:returns: Dictionary color -> 64 bit hash
+	'''
+
+	hashes = {}
+	for y, color in enumerate(column):
+		hashes[color] = hashes.get(color, 0) ^ zobristRow(y)
+
+	return hashes
+
+
+def colorBoardHashes(columnColorHashes):
+	'''
+	Combines the hashes of `colorColumnHashes` of all columns to one hash per color, the same way `zobristBoardHash` combines column hashes.
+
+	:param columnColorHashes: The dictionaries of all columns from left to right
+	:returns: Dictionary color -> 64 bit hash
+	'''
+
+	hashes = {}
+	for x, columnHashes in enumerate(columnColorHashes):
+		for color, h in columnHashes.items():
+			hashes[color] = hashes.get(color, 0) ^ ((h * zobristColumn(x)) & 0xFFFFFFFFFFFFFFFF)
+
+	return hashes
+
+
+def zobristBoardHash(columnHashes):
+	'''
+	Combines the column hashes of a board to the Zobrist hash of the board.
+
+	:param columnHashes: The hashes of all columns from left to right
+	:returns: The 64 bit hash of the board
+	'''
+
+	h = 0
+	for x, columnHash in enumerate(columnHashes):
+		h ^= (columnHash * zobristColumn(x)) & 0xFFFFFFFFFFFFFFFF
+
+	return h
+
+
+def popOption(args, name, default=None):
+	'''
+	Removes an option of the form `name value` from the argument list and returns its value. This way, options can be given anywhere on the command line without changing the meaning of the other arguments.
+
+	:param args: The argument list (usually `sys.argv`). CHANGED IN PLACE!
+	:param name: The name of the option, e.g. `--engine`
+	:param default: The value that is returned, if the option is not given
+	:returns: The value of the option
+	'''
+
+	if name in args:
+		i = args.index(name)
+		if i + 1 < len(args):
+			value = args[i+1]
+			del args[i:i+2]
+			return value
+		del args[i]
+
+	return default
+
+
+def popFlag(args, name):
+	'''
+	Removes an option without value, e.g. `--profile`, from the argument list.
+
+	:param args: The argument list (usually `sys.argv`). CHANGED IN PLACE!
+	:param name: The name of the option
+	:returns: True if the option was given, else False
+	'''
+
+	if name in args:
+		args.remove(name)
+		return True
+
+	return False
+
+
+def serializeBoard(board):
+	'''
+	Packs a board into bytes to send it to other processes: the original number of columns and rows, the score and the number of moves, the moves and one byte per element (column by column). Works for all board classes, but only for colors up to 255.
+
+	:param board: The board to pack
+	:returns: The board as bytes
+	'''
+
+	header = struct.pack('<HHqI', board.origColumns, board.origRows, board.score, len(board.moves))
+	moves = struct.pack('<' + 'H' * (2 * len(board.moves)), *[a for move in board.moves for a in move])
+	cells = bytes([board.getColor(x, y) for x in range(board.origColumns) for y in range(board.origRows)])
+
+	return header + moves + cells
+
+
+def deserializeBoard(data, boardClass=Board):
+	'''
+	Unpacks a board packed by `serializeBoard`.
+
+	:param data: The packed board
+	:param boardClass: The class of the new board
+	:returns: The board
+	'''
+
+	columns, rows, score, numOfMoves = struct.unpack_from('<HHqI', data)
+	offset = struct.calcsize('<HHqI')
+	moves = struct.unpack_from('<' + 'H' * (2 * numOfMoves), data, offset)
+	offset += 4 * numOfMoves
+	cells = data[offset:offset + columns * rows]
+
+	board = boardClass([cells[x * rows:(x + 1) * rows] for x in range(columns)])
+	board.score = score
+	board.moves = list(zip(moves[0::2], moves[1::2]))
+	# The board may have lost columns and rows already
+	board.columns = len([x for x in range(columns) if cells[x * rows]])
+	board.rows = board.getHeight()
+
+	return board
+
+
+def usage():
+	'''
+	Prints program usage.
+	'''
+
+	print('Usage:')
+	print('Input via stdin: python3 samegame.py')
+	print('Input via argument: python3 samegame.py [[0, 1],[0, 1]]')
+	print('Input from file with one line in file: python3 samegame.py filename.txt')
+	print('Input from file as grid (tsv): python3 samegame.py grid filename.txt')
+	print('Input from binary file (first board): python3 samegame.py binary filename.sgb')
+	print('Random board with size 8 x 5 and color distribution 1,2,1,1: python3 samegame.py 8 5 1,2,1,1')
+	print('Random board as above with seed 42: python3 samegame.py 8 5 1,2,1,1 42')
+	print('Many boards, one per line, from a file or stdin (-): python3 samegame.py batch [oneline|grid|binary] [filename.txt|-]')
+	print('    Writes one JSON object per board and line with the keys id, score, moves and time. Boards in grid format are separated by empty lines.')
+	print('    With binary, the boards are read from a file written by pack.')
+	print('Pack many boards into a binary file (colors up to 15): python3 samegame.py pack [oneline|grid] [filename.txt|-] filename.sgb')
+	print('Many random boards, e.g. 1000 boards of size 8 x 5 with seed 42: python3 samegame.py generate [oneline|binary] 8 5 1,2,1,1 1000 42')
+	print('    Board i is the same for any number of boards and --workers and can be made again with generateBoard(8, 5, [1, 2, 1, 1], 42, i).')
+	print('    Writes to --out (needed for binary) or stdout.')
+	print('Compare all implementations on random moves: python3 samegame.py check')
+	print('    Replays the same moves on every implementation and compares board, score and remaining points after each move; exits with 1 on any difference.')
+	print('Benchmark of all implementations: python3 samegame.py bench')
+	print('    Writes the times of the primitives and AIs on random boards as JSON (--out) and as table to stdout.')
+	print('Server on localhost: python3 samegame.py serve')
+	print('    POST /solve {"board": "[[0, 1],[0, 1]]", "timeLimit": 5} plays a board (player, engine, width, level and iterations may be given as well), GET /stats shows the counters.')
+	print('')
+	print('Options (may be given anywhere):')
+	print('--engine list|unionfind|bit|indexed: Board implementation to use (default: list)')
+	print('--player best|worst|bfs|bfsnodouble|bfsparallel|bfsdisk|beam|nmcs|anytime|bnb: AI to play the board (default: best)')
+	print('--width N: Number of boards per layer of the beam search (default: 100)')
+	print('--heuristic final|areas: How the beam and anytime search rate boards: score after stopping, or after removing every area once (default: final)')
+	print('--level N: Nesting level of the Nested Monte Carlo Search (default: 2)')
+	print('--iterations N: Maximum number of rollouts of the Nested Monte Carlo Search, or boards expanded by bnb (default: no limit)')
+	print('--time-limit S: Maximum time in seconds of the Nested Monte Carlo Search, the anytime search and bnb (default: no limit)')
+	print('--memory MB: Memory for the frontier of bfsdisk, the rest is written to temporary files in TMPDIR (default: 64)')
+	print('--workers N: Make each first move in another process and play the rest with the chosen AI, N processes at a time.')
+	print('             With --player bfsparallel: number of processes that expand each layer of the BFS.')
+	print('             With batch and serve: number of processes that play the boards.')
+	print('             With generate: number of processes that generate the boards (default: one per CPU).')
+	print('--order input|completion: Order of the results of batch (default: input)')
+	print('--port N: Port of serve (default: 8080)')
+	print('--sizes N,N,...: Board sizes (N x N) of bench and check (default: 10,25,50,100 for bench, 5,10,20 for check)')
+	print('--colors N,N,...: Numbers of colors of bench and check (default: 3,5)')
+	print('--boards N: Boards per size and number of colors of check (default: 5)')
+	print('--repeat N: Repetitions of each measurement of bench (default: 3)')
+	print('--player-size N: Largest board size the AIs are timed on by bench (default: 50)')
+	print('--impl NAME,NAME,...: Only benchmark or check implementations starting with one of the names, e.g. samegame.bit,np (default: all)')
+	print('--out FILE: JSON file of bench (default: bench.json) or output file of generate')
+	print('--verbose N: 0: no output of the AI (default), 1: progress, 2: also the board after each move (for play.html), 3: also debug information')
+	print('--canonical: bfsnodouble, beam and bnb treat boards that only differ by the numbers of the colors as equal')
+	print('--profile: print cProfile statistics and the counters and times of the primitives (see `Profiler`) to STDERR after playing')
+
+
+# Translation table from the ASCII digits to their values
+digitValues = bytes.maketrans(b'0123456789', bytes(range(10)))
+
+
+def parseGrid(grid):
+	'''
+	Reads a board in one-line format (see competition guidelines) or in tab-separated format (one column per line) without converting one into the other. The bytes are split and converted by `int` at once, which is much faster than handling every element on its own.
+
+	:param grid: The board as string or bytes, or as list of columns (each an iterable of colors)
+	:returns: Tuple (list of columns, each a list of colors from bottom to top; dictionary of the number of elements per color in order of appearance)
+	'''
+
+	if isinstance(grid, str):
+		grid = grid.encode('ascii')
+	if isinstance(grid, (bytes, bytearray)):
+		grid = grid.strip()
+		if grid.startswith(b'['):
+			# Remove all whitespace and the first and last two brackets
+			tokens = [column.split(b',') for column in grid.translate(None, b' \t\r\n')[2:-2].split(b'],[')]
+		else:
+			tokens = [line.split() for line in grid.splitlines() if line.strip()]
+		columns = []
+		for column in tokens:
+			# Colors up to 9 are translated directly from their digits
+			digits = b''.join(column)
+			if len(digits) == len(column) and digits.isdigit():
+				columns.append(list(digits.translate(digitValues)))
+			else:
+				columns.append(list(map(int, column)))
+	else:
+		columns = [list(column) for column in grid]
+
+	colors = collections.Counter()
+	for column in columns:
+		colors.update(column)
+	del colors[0]
+
+	return columns, dict(colors)
+
+
+def gridToOneLine(s):
+	'''
+	Converts a board in tab-separated format to the one-line format described in the competition guidelines.
+
+	:param s: The board in tab-separated format
+	:returns: The board in one-line format
+	'''
+
+	grid = []
+	for line in s.split('\n'):
+		grid.append(', '.join(line.split()))
+
+	return '[[' + '], ['.join(grid) + ']]'
+
+
+def readBoards(f, style='oneline'):
+	'''
+	Reads boards from a file one after another, without reading the whole file first.
+
+	:param f: The file (or e.g. `sys.stdin`)
+	:param style: `oneline`: one board per line; `grid`: boards in tab-separated format, separated by empty lines
+	:returns: Generator of boards as strings in the format of the file (see `parseGrid`)
+	'''
+
+	if style == 'oneline':
+		for line in f:
+			line = line.strip()
+			if line:
+				yield line
+		return
+
+	block = []
+	for line in f:
+		line = line.strip()
+		if line:
+			block.append(line)
+		elif block:
+			yield '\n'.join(block)
+			block = []
+	if block:
+		yield '\n'.join(block)
+
+
+# Binary board files (see `writeBoardFile`): magic, number of boards and position of the index
+boardFileMagic = b'SGB1'
+boardFileHeader = struct.Struct('<4sIQ')
+# Header of each board: columns, rows and number of colors
+boardRecordHeader = struct.Struct('<HHB')
+# Translation tables for packing two elements into one byte
+highNibble = bytes([(i << 4) & 0xFF for i in range(256)])
+highToLow = bytes([i >> 4 for i in range(256)])
+lowNibble = bytes([i & 15 for i in range(256)])
+
+
+def packCells(cells):
+	'''
+	Packs elements with colors up to 15 into 4 bits each, the first element in the high bits.
+
+	:param cells: The colors as bytes
+	:returns: The packed bytes (half as many, rounded up)
+	'''
+
+	if len(cells) % 2:
+		cells += b'\0'
+	high = cells[0::2].translate(highNibble)
+	low = cells[1::2]
+
+	return (int.from_bytes(high, 'big') | int.from_bytes(low, 'big')).to_bytes(len(low), 'big')
+
+
+def unpackCells(data, count):
+	'''
+	Unpacks elements packed by `packCells`.
+
+	:param data: The packed bytes
+	:param count: The number of elements
+	:returns: The colors as bytearray
+	'''
+
+	cells = bytearray(2 * len(data))
+	cells[0::2] = data.translate(highToLow)
+	cells[1::2] = data.translate(lowNibble)
+
+	return cells[:count]
+
+
+def writeBoardFile(f, boards):
+	'''
+	Writes many boards into a binary file: a header (magic `SGB1`, number of boards and position of the index), the boards and an index with the position of each board (8 bytes each). A board is its number of columns, rows and colors followed by the elements column by column in 4 bits each (see `packCells`), so colors must not be larger than 15. Read the file with `BoardFile`.
+
+	:param f: The file, opened for writing in binary mode. It must be seekable.
+	:param boards: Iterable of boards in any format `parseGrid` accepts
+	:returns: The number of boards written
+	'''
+
+	start = f.tell()
+	f.write(boardFileHeader.pack(boardFileMagic, 0, 0))
+	index = []
+	for grid in boards:
+		columns, colors = parseGrid(grid)
+		if colors and max(colors) > 15:
+			raise ValueError('Boards in binary files must have colors up to 15')
+		index.append(f.tell() - start)
+		f.write(boardRecordHeader.pack(len(columns), len(columns[0]), len(colors)))
+		f.write(packCells(b''.join([bytes(column) for column in columns])))
+
+	indexOffset = f.tell() - start
+	f.write(struct.pack('<{}Q'.format(len(index)), *index))
+	end = f.tell()
+	f.seek(start)
+	f.write(boardFileHeader.pack(boardFileMagic, len(index), indexOffset))
+	f.seek(end)
+
+	return len(index)
+
+
+class BoardFile():
+	'''
+	Reads a file written by `writeBoardFile`. The file is memory-mapped and the boards are only unpacked when they are accessed, so `boardFile[i]` reads one board of a large file without reading the others. The boards are lists of columns that all board classes accept.
+
+	Use as context manager or call `close`.
+	'''
+
+	def __init__(self, filename):
+		'''
+		Opening the file. See class description for details.
+
+		:param filename: The name of the file
+		'''
+
+		self.file = open(filename, 'rb')
+		try:
+			self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+			magic, self.count, self.indexOffset = boardFileHeader.unpack_from(self.map)
+		except (ValueError, struct.error):
+			self.file.close()
+			raise ValueError('{} is not a board file'.format(filename))
+		if magic != boardFileMagic:
+			self.close()
+			raise ValueError('{} is not a board file'.format(filename))
+
+
+	def __len__(self):
+		'''
+		The number of boards in the file.
+		'''
+
+		return self.count
+
+
+	def __getitem__(self, i):
+		'''
+		Reads one board.
+
+		:param i: The index of the board (negative values count from the end)
+		:returns: The board as list of columns
+		'''
+
+		if i < 0:
+			i += self.count
+		if not 0 <= i < self.count:
+			raise IndexError('board index out of range')
+
+		offset, = struct.unpack_from('<Q', self.map, self.indexOffset + 8 * i)
+		columns, rows, numOfColors = boardRecordHeader.unpack_from(self.map, offset)
+		offset += boardRecordHeader.size
+		cells = unpackCells(self.map[offset:offset + (columns * rows + 1) // 2], columns * rows)
+
+		return [list(cells[x * rows:(x + 1) * rows]) for x in range(columns)]
+
+
+	def __iter__(self):
+		'''
+		Iterates over all boards in the order of the file.
+		'''
+
+		for i in range(self.count):
+			yield self[i]
+
+
+	def close(self):
+		'''
+		Closes the file.
+		'''
+
+		self.map.close()
+		self.file.close()
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *args):
+		self.close()
+
+
+def solveBoard(task):
+	'''
+	Worker of `solveBatch`. Plays one board with an AI without output. A board that cannot be read or played does not stop the batch, its result is the error instead.
+
+	:param task: Tuple (id of the board, board in any format `parseGrid` accepts, name of the AI, name of the engine, options)
+	:returns: Dictionary with the id, the final score, the moves and the time in seconds, or with the id and the error message
+	'''
+
+	boardId, line, player, engine, options = task
+	try:
+		board = engines[engine](line)
+		now = time.perf_counter()
+		result = runPlayer(player, board, options)
+		elapsed = time.perf_counter() - now
+		# The shortsighted AIs return a string and leave the moves in the board
+		if isinstance(result, str):
+			moves = board.moves
+		else:
+			moves = list(result)
+
+		final = engines[engine](line)
+		for x, y in moves:
+			final.click(x, y)
+	except Exception as e:
+		return {'id': boardId, 'error': str(e)}
+
+	return {'id': boardId, 'score': final.score - final.calcRemainingPoints(), 'moves': final.moves, 'time': elapsed}
+
+
+def solveBatch(boards, player='best', engine='list', options={}, workers=None, order='input', out=sys.stdout):
+	'''
+	Plays many boards in a pool of processes and writes one JSON object per board and line as soon as it is known (see `solveBoard`; boards that fail get an object with `error`). The ids are the positions of the boards in `boards`, starting at 0. Only a few boards per process are read ahead, so `boards` may be an endless stream.
+
+	:param boards: Iterable of boards in any format `parseGrid` accepts (see `readBoards` and `BoardFile`)
+	:param player: The name of the AI (see `players`)
+	:param engine: The name of the board class (see `engines`)
+	:param options: Options for the AI (see `runPlayer`)
+	:param workers: Number of processes (None for one per CPU)
+	:param order: `input`: results in the order of the boards; `completion`: results in the order they are finished
+	:param out: The file to write to
+	:returns: The number of boards played
+	'''
+
+	if order not in ('input', 'completion'):
+		raise ValueError('Unknown order {}'.format(order))
+
+	def write(result):
+		out.write(json.dumps(result) + '\n')
+		out.flush()
+
+	if workers is None:
+		workers = os.cpu_count() or 1
+	maxPending = 4 * workers
+
+	with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+		pending = collections.deque()
+		count = 0
+		for boardId, line in enumerate(boards):
+			pending.append(pool.submit(solveBoard, (boardId, line, player, engine, options)))
+			count += 1
+			while len(pending) >= maxPending:
+				if order == 'input':
+					write(pending.popleft().result())
+				else:
+					done, notDone = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+					for future in done:
+						write(future.result())
+					pending = collections.deque([future for future in pending if future in notDone])
+		if order == 'input':
+			for future in pending:
+				write(future.result())
+		else:
+			for future in concurrent.futures.as_completed(pending):
+				write(future.result())
+
+	return count
+
+
+def percentile(values, p):
+	'''
+	Nearest-rank percentile.
+
+	:param values: Sorted list of numbers, not empty
+	:param p: The percentile between 0 and 100
+	:returns: The smallest value that is at least as large as `p` percent of the values
+	'''
+
+	rank = max(1, -(-len(values) * p // 100))
+
+	return values[int(rank) - 1]
+
+
+class SolveServer():
+	'''
+	A small HTTP server for localhost that plays boards in a pool of processes, which are started once and then kept running. Endpoints:
+	- POST /solve with a JSON object with the board in one-line format as `board` and optionally `player`, `engine`, `timeLimit`, `width`, `level` and `iterations`. The time limit is given to the AI (see `runPlayer`) and is only accepted for the AIs in `timedPlayers`; if the AI does not finish in time anyway, the answer is 504. Invalid requests are answered with 400 before anything is played. If a process of the pool dies, the answer is 503 and a new pool is started. Answer: like `solveBoard`.
+	- GET /stats: number of requests waiting and running, number of boards played and failed, and the latency of the last requests in seconds. A request counts as running until its process has finished the board, even if the answer was 504.
+	'''
+
+	def __init__(self, player='best', engine='list', options={}, workers=None, port=8080):
+		'''
+		Initiating the server. The processes are started by `run`.
+
+		:param player: The name of the AI for requests without `player`
+		:param engine: The name of the board class for requests without `engine`
+		:param options: Options for the AI for requests without them (see `runPlayer`)
+		:param workers: Number of processes (None for one per CPU)
+		:param port: The port on localhost
+		'''
+
+		self.player = player
+		self.engine = engine
+		self.options = options
+		self.workers = workers or os.cpu_count() or 1
+		self.port = port
+		self.pool = None
+		self.pending = 0
+		self.served = 0
+		self.failed = 0
+		self.nextId = 0
+		self.latencies = collections.deque(maxlen=1000)
+
+
+	def stats(self):
+		'''
+		:returns: Dictionary with the counters of the server
+		'''
+
+		latencies = sorted(self.latencies)
+		result = {'pending': self.pending, 'queued': max(0, self.pending - self.workers), 'workers': self.workers, 'served': self.served, 'failed': self.failed}
+		if latencies:
+			result['latency'] = {'count': len(latencies), 'mean': sum(latencies) / len(latencies), 'p50': percentile(latencies, 50), 'p90': percentile(latencies, 90), 'p99': percentile(latencies, 99), 'max': latencies[-1]}
+
+		return result
+
+
+	def checkOptions(self, options):
+		'''
+		Checks the types and ranges of the options of a request.
+
+		:param options: Options for the AI (see `runPlayer`)
+		:returns: The error message, or None if the options are valid
+		'''
+
+		timeLimit = options.get('timeLimit')
+		if timeLimit is not None and (not isinstance(timeLimit, (int, float)) or isinstance(timeLimit, bool) or not 0 < timeLimit < float('inf')):
+			return 'timeLimit must be a positive number of seconds'
+		for key, minimum in (('width', 1), ('level', 0), ('iterations', 1)):
+			value = options.get(key)
+			if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < minimum):
+				return '{} must be an integer of at least {}'.format(key, minimum)
+
+		return None
+
+
+	def jobDone(self, job):
+		'''
+		Counts a board as finished once its process is done with it.
+
+		:param job: The `concurrent.futures.Future` of the board
+		'''
+
+		self.pending -= 1
+
+
+	def restartPool(self, pool):
+		'''
+		Replaces a pool that broke because one of its processes died. Does nothing if it was replaced already.
+
+		:param pool: The broken pool
+		'''
+
+		if self.pool is pool:
+			self.pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+			pool.shutdown(wait=False)
+
+
+	async def solve(self, request):
+		'''
+		Plays a board in the pool.
+
+		:param request: The JSON object of the request
+		:returns: Tuple (HTTP status, JSON object of the answer)
+		'''
+
+		if not isinstance(request, dict) or not isinstance(request.get('board'), str):
+			return 400, {'error': 'board missing'}
+		player = request.get('player', self.player)
+		engine = request.get('engine', self.engine)
+		if not isinstance(player, str) or player not in players or player == 'bfsparallel':
+			return 400, {'error': 'Unknown player {}'.format(player)}
+		if not isinstance(engine, str) or engine not in engines:
+			return 400, {'error': 'Unknown engine {}'.format(engine)}
+		options = dict(self.options)
+		for key in ('width', 'level', 'iterations', 'timeLimit'):
+			if key in request:
+				options[key] = request[key]
+		error = self.checkOptions(options)
+		if error is not None:
+			return 400, {'error': error}
+		# A worker cannot be stopped, so an AI that ignores the time limit would keep it busy after the answer 504
+		if options.get('timeLimit') is not None and player not in timedPlayers:
+			return 400, {'error': 'Player {} does not support a time limit'.format(player)}
+
+		boardId = self.nextId
+		self.nextId += 1
+		now = time.perf_counter()
+		loop = asyncio.get_running_loop()
+		pool = self.pool
+		try:
+			job = pool.submit(solveBoard, (boardId, request['board'], player, engine, options))
+		except concurrent.futures.process.BrokenProcessPool:
+			self.restartPool(pool)
+			self.failed += 1
+			return 503, {'error': 'worker process died, try again'}
+		# The board keeps its process busy after a 504, so it is pending until the process is done
+		self.pending += 1
+		job.add_done_callback(lambda job: loop.call_soon_threadsafe(self.jobDone, job))
+		try:
+			# Some grace time for the queue and the last rollout. A board that still waits in the queue is cancelled.
+			timeout = None if options.get('timeLimit') is None else 2 * options['timeLimit'] + 1
+			result = await asyncio.wait_for(asyncio.wrap_future(job), timeout)
+		except asyncio.TimeoutError:
+			self.failed += 1
+			return 504, {'error': 'time limit exceeded'}
+		except concurrent.futures.process.BrokenProcessPool:
+			self.restartPool(pool)
+			self.failed += 1
+			return 503, {'error': 'worker process died, try again'}
+		except Exception as e:
+			self.failed += 1
+			return 400, {'error': 'could not play the board: {}'.format(e)}
+		if 'error' in result:
+			self.failed += 1
+			return 400, {'error': 'could not play the board: {}'.format(result['error'])}
+		self.served += 1
+		self.latencies.append(time.perf_counter() - now)
+
+		return 200, result
+
+
+	async def handle(self, reader, writer):
+		'''
+		Answers one HTTP request and closes the connection.
+
+		:param reader: The `asyncio.StreamReader` of the connection
+		:param writer: The `asyncio.StreamWriter` of the connection
+		'''
+
+		try:
+			requestLine = (await reader.readline()).decode('latin-1').split()
+			headers = {}
+			while True:
+				line = (await reader.readline()).decode('latin-1').strip()
+				if not line:
+					break
+				key, _, value = line.partition(':')
+				headers[key.strip().lower()] = value.strip()
+			body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+			if len(requestLine) < 2:
+				status, answer = 400, {'error': 'bad request'}
+			elif requestLine[1] == '/stats':
+				status, answer = 200, self.stats()
+			elif requestLine[1] == '/solve':
+				if requestLine[0] != 'POST':
+					status, answer = 405, {'error': 'use POST'}
+				else:
+					try:
+						request = json.loads(body)
+					except ValueError:
+						status, answer = 400, {'error': 'invalid JSON'}
+					else:
+						status, answer = await self.solve(request)
+			else:
+				status, answer = 404, {'error': 'not found'}
+		except (asyncio.IncompleteReadError, ValueError):
+			status, answer = 400, {'error': 'bad request'}
+
+		data = json.dumps(answer).encode()
+		reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+		writer.write('HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\nConnection: close\r\n\r\n'.format(status, reasons[status], len(data)).encode() + data)
+		try:
+			await writer.drain()
+		except ConnectionError:
+			pass
+		writer.close()
+
+
+	async def serve(self):
+		'''
+		Starts the processes, plays one board in each of them to load everything, and answers requests until cancelled.
+		'''
+
+		loop = asyncio.get_running_loop()
+		# The pool may be replaced by `restartPool`, so the current one is shut down at the end
+		self.pool = concurrent.futures.ProcessPoolExecutor(self.workers)
+		try:
+			await asyncio.gather(*[loop.run_in_executor(self.pool, solveBoard, (None, testgrid, 'best', self.engine, {})) for i in range(self.workers)])
+			server = await asyncio.start_server(self.handle, '127.0.0.1', self.port)
+			print('Serving on http://127.0.0.1:{}'.format(self.port), file=sys.stderr)
+			async with server:
+				await server.serve_forever()
+		finally:
+			self.pool.shutdown()
+
+
+	def run(self):
+		'''
+		Runs the server until it is interrupted (e.g. with Ctrl-C).
+		'''
+
+		try:
+			asyncio.run(self.serve())
+		except KeyboardInterrupt:
+			pass
+
+
+def loadImplementation(filename):
+	'''
+	Imports one of the other samegame scripts next to this file as a module (their file names are no valid module names).
+
+	:param filename: The file name, e.g. `class-less_samegame.py`
+	:returns: The module
+	'''
+
+	path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+	spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0].replace('-', '_'), path)
+	module = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(module)
+
+	return module
+
+
+def clickInPlace(board, x, y, toChange=None):
+	'''
+	Clicks on a board that is changed in place and returns it, like the `click` of the class-less scripts and of `BoardState` return the new board.
+	'''
+
+	board.click(x, y, toChange)
+
+	return board
+
+
+def benchmarkTargets():
+	'''
+	Collects the implementations to benchmark and to compare: every engine of this file, `BoardState`, np_samegame.py (if numpy is installed), class-less_samegame.py and shrinkField_samegame.py. Each one is a dictionary with the functions `make(grid)`, `floodFill(board, x, y)`, `findAreas(board)`, `click(board, x, y, toChange=None)` (returns the board; `toChange` is a result of `floodFill`), `columns(board)` (see `gridColumns`), `score(board)`, `remaining(board)` (the remaining points) and `players`, a dictionary of AIs that play a board made by `make`. The BFS AIs are left out, as they do not finish on boards of this size, and so is the Nested Monte Carlo Search, which needs minutes even on level 1. The search AIs only differ in the search, so the beam search (with a small width) is only timed once, on `BoardState`.
+
+	:returns: Dictionary with the name of the implementation as key
+	'''
+
+	targets = {}
+	for name, boardClass in engines.items():
+		targets['samegame.' + name] = {'make': boardClass, 'floodFill': lambda b, x, y: b.floodFill(x, y), 'findAreas': lambda b: b.findAreas(), 'click': clickInPlace, 'columns': lambda b: gridColumns([[b.getColor(x, y) for y in range(b.origRows)] for x in range(b.origColumns)]), 'score': lambda b: b.score, 'remaining': lambda b: b.calcRemainingPoints(), 'players': {'best': playShortsightedBestField, 'worst': playShortsightedWorstField}}
+	targets['samegame.state'] = {'make': BoardState, 'floodFill': lambda b, x, y: b.floodFill(x, y), 'findAreas': lambda b: b.findAreas(), 'click': lambda b, x, y, toChange=None: b.click(x, y, toChange), 'columns': lambda b: b.board, 'score': lambda b: b.score, 'remaining': lambda b: b.calcRemainingPoints(), 'players': {'beam': lambda b: playBeamSearch(b, 4)}}
+
+	try:
+		npModule = loadImplementation('np_samegame.py')
+	except ImportError:
+		print('numpy is not installed, skipping np_samegame.py', file=sys.stderr)
+	else:
+		targets['np_samegame'] = {'make': npModule.Board, 'floodFill': lambda b, x, y: b.floodFill(x, y), 'findAreas': lambda b: b.findAreas(), 'click': clickInPlace, 'columns': lambda b: gridColumns(b.board.tolist()), 'score': lambda b: b.score, 'remaining': lambda b: b.calcRemainingPoints(), 'players': {'best': npModule.playShortsightetBestField, 'worst': npModule.playShortsightetWorstField}}
+
+	classless = loadImplementation('class-less_samegame.py')
+	targets['class-less_samegame'] = {'make': classless.createBoard, 'floodFill': lambda b, x, y: classless.floodFill(b['b'], b['columns'], b['rows'], x, y), 'findAreas': lambda b: classless.findAreas(b['b'], b['columns'], b['rows']), 'click': classless.click, 'columns': lambda b: gridColumns(b['b']), 'score': lambda b: b['score'], 'remaining': lambda b: classless.calcRemainingPoints(b['b'], b['columns'], b['rows']), 'players': {'best': classless.playShortsightedBestField, 'worst': classless.playShortsightedWorstField}}
+
+	shrinkField = loadImplementation('shrinkField_samegame.py')
+	targets['shrinkField_samegame'] = {'make': shrinkField.createBoard, 'floodFill': lambda b, x, y: shrinkField.floodFill(b['b'], x, y), 'findAreas': lambda b: shrinkField.findAreas(b['b']), 'click': shrinkField.click, 'columns': lambda b: gridColumns(b['b']), 'score': lambda b: b['score'], 'remaining': lambda b: shrinkField.calcRemainingPoints(b['b']), 'players': {'best': shrinkField.playShortsightedBestField, 'worst': shrinkField.playShortsightedWorstField}}
+
+	return targets
+
+
+def gridColumns(grid):
+	'''
+	Converts a board given as list of columns (each from bottom to top, 0 for empty elements) to the form of `BoardState.board`: a tuple of the non-empty columns without empty elements. Equal boards of all implementations thus become equal tuples.
+
+	:param grid: List of columns
+	:returns: Tuple of tuples
+	'''
+
+	columns = []
+	for column in grid:
+		column = tuple([c for c in column if c])
+		if column:
+			columns.append(column)
+
+	return tuple(columns)
+
+
+def randomMoveSequence(grid, seed):
+	'''
+	Plays a board with random moves: a random area, and a random element of it to click on. The result is what every implementation has to reproduce in `differentialTest`.
+
+	:param grid: The board in one-line format
+	:param seed: Seed of the moves
+	:returns: List of tuples `(move, columns, score, remaining points)` after each move (see `gridColumns`), starting with `(None, ...)` for the board before the first move
+	'''
+
+	rng = random.Random(seed)
+	board = BoardState(grid)
+	steps = [(None, board.board, board.score, board.calcRemainingPoints())]
+	areas = board.findAreas()
+	while areas:
+		area = rng.choice(areas)
+		x, y = rng.choice(sorted(area[3]))
+		board = board.click(x, y)
+		steps.append(((x, y), board.board, board.score, board.calcRemainingPoints()))
+		areas = board.findAreas()
+
+	return steps
+
+
+def differentialTest(targets, grids, seed=0):
+	'''
+	Replays the same random move sequences (see `randomMoveSequence`) on every implementation, and compares the board, the score and the remaining points after each click. Every second click gets the field from the `floodFill` of the implementation, to test clicks with precomputed areas as well. After the first difference, the rest of the board is skipped for that implementation.
+
+	:param targets: The implementations (see `benchmarkTargets`)
+	:param grids: List of boards in one-line format
+	:param seed: Seed of the moves; board i is played with seed `seed + i`
+	:returns: Tuple (list of differences as tuples `(implementation, index of the board, number of the move, move, list of what differs)`, dictionary with the number of clicks and the time of the clicks in seconds per implementation)
+	'''
+
+	differences = []
+	timing = {name: [0, 0.0] for name in targets}
+
+	for i, grid in enumerate(grids):
+		steps = randomMoveSequence(grid, seed + i)
+		for name, target in targets.items():
+			board = target['make'](grid)
+			for n, (move, columns, score, remaining) in enumerate(steps):
+				if move is not None:
+					x, y = move
+					toChange = target['floodFill'](board, x, y) if n % 2 == 0 else None
+					now = time.perf_counter()
+					board = target['click'](board, x, y, toChange)
+					timing[name][1] += time.perf_counter() - now
+					timing[name][0] += 1
+				actual = (target['columns'](board), target['score'](board), target['remaining'](board))
+				if actual != (columns, score, remaining):
+					what = [w for w, a, e in zip(('board', 'score', 'remaining points'), actual, (columns, score, remaining)) if a != e]
+					differences.append((name, i, n, move, what))
+					break
+
+	return differences, timing
+
+
+def summarizeTimes(implementation, operation, size, colors, seed, times):
+	'''
+	Summarizes the times of single operations for `benchmark`.
+
+	:param times: List of times in seconds, one per operation
+	:returns: Dictionary with the number of operations, the total time, operations per second, and minimum, percentiles and maximum of the times
+	'''
+
+	times = sorted(times)
+	total = sum(times)
+
+	return {'implementation': implementation, 'operation': operation, 'columns': size, 'rows': size, 'colors': colors, 'seed': seed, 'count': len(times), 'total': total, 'opsPerSec': len(times) / total if total else None, 'min': times[0], 'p50': percentile(times, 50), 'p90': percentile(times, 90), 'p99': percentile(times, 99), 'max': times[-1]}
+
+
+def benchmark(targets, sizes=(10, 25, 50, 100), colorCounts=(3, 5), repeat=3, seed=0, floodFills=100, clicks=100, maxPlayerSize=50):
+	'''
+	Times the primitives and the AIs of each implementation on seeded random boards (see `randomBoard`) of every size and number of colors:
+	- floodFill: from `floodFills` random elements of the full board
+	- findAreas: on the full board
+	- click: up to `clicks` clicks on the largest area (including gravity; finding the areas is not timed)
+	- player:<name>: one whole game of the AI (its output is discarded), only on boards up to `maxPlayerSize`, as a game on a large board takes minutes
+	Every measurement is done `repeat` times.
+
+	:param targets: The implementations (see `benchmarkTargets`)
+	:param sizes: The sizes of the boards; a size of 10 is a board of 10 x 10
+	:param colorCounts: The numbers of colors, all equally frequent
+	:param repeat: The number of repetitions
+	:param seed: Seed of the boards and of the elements to start the flood fills from
+	:param floodFills: The number of flood fills per repetition
+	:param clicks: The maximum number of clicks per repetition
+	:param maxPlayerSize: The largest size of the boards the AIs are timed on
+	:returns: List of dictionaries, one per implementation, operation and board (see `summarizeTimes`)
+	'''
+
+	results = []
+	for size in sizes:
+		for colors in colorCounts:
+			grid = randomBoard(size, size, [1] * colors, seed)
+			rng = random.Random(seed)
+			cells = [(rng.randrange(size), rng.randrange(size)) for i in range(floodFills)]
+
+			for name, target in targets.items():
+				board = target['make'](grid)
+				times = []
+				for r in range(repeat):
+					for x, y in cells:
+						now = time.perf_counter()
+						target['floodFill'](board, x, y)
+						times.append(time.perf_counter() - now)
+				results.append(summarizeTimes(name, 'floodFill', size, colors, seed, times))
+
+				times = []
+				for r in range(repeat):
+					now = time.perf_counter()
+					target['findAreas'](board)
+					times.append(time.perf_counter() - now)
+				results.append(summarizeTimes(name, 'findAreas', size, colors, seed, times))
+
+				times = []
+				for r in range(repeat):
+					board = target['make'](grid)
+					areas = target['findAreas'](board)
+					for i in range(clicks):
+						if not areas:
+							break
+						area = max(areas, key=lambda a: a[2])
+						now = time.perf_counter()
+						board = target['click'](board, area[0], area[1])
+						times.append(time.perf_counter() - now)
+						areas = target['findAreas'](board)
+				if times:
+					results.append(summarizeTimes(name, 'click', size, colors, seed, times))
+
+				for player, play in target['players'].items():
+					if size > maxPlayerSize:
+						break
+					times = []
+					for r in range(repeat):
+						board = target['make'](grid)
+						with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+							now = time.perf_counter()
+							play(board)
+							times.append(time.perf_counter() - now)
+					results.append(summarizeTimes(name, 'player:' + player, size, colors, seed, times))
+
+				print('{:>7} {:>2} colors {}'.format('{0}x{0}'.format(size), colors, name), file=sys.stderr)
+
+	return results
+
+
+def writeBenchmark(results, filename):
+	'''
+	Writes the results of `benchmark` with some information about the machine as JSON, and a table to stdout.
+
+	:param results: The results of `benchmark`
+	:param filename: The name of the JSON file
+	'''
+
+	with open(filename, 'w') as f:
+		json.dump({'python': sys.version, 'platform': sys.platform, 'cpus': os.cpu_count(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=1)
+
+	print('{:<22} {:<14} {:>7} {:>6} {:>12} {:>12} {:>12}'.format('implementation', 'operation', 'size', 'colors', 'ops/sec', 'p50 [ms]', 'p99 [ms]'))
+	for r in results:
+		print('{:<22} {:<14} {:>7} {:>6} {:>12.1f} {:>12.3f} {:>12.3f}'.format(r['implementation'], r['operation'], '{}x{}'.format(r['columns'], r['rows']), r['colors'], r['opsPerSec'] or 0, r['p50'] * 1000, r['p99'] * 1000))
+
+
+def randomBoard(cols, rows, colorDistribution, seed=None):
+	'''
+	Taken (and only slightly modified) from https://github.com/Roxxik/SameGame/blob/master/old/core.py
+
+	Generates a random board with `cols` columns and `rows` rows. It has `len(colorDistribution)` with a distribution given in `colorDistribution`. A distribution of `[1, 2, 1]` means that there are as many 2's as there are 1's and 3's.
+
+	:param cols: The number of columns of the board
+	:param rows: The number of rows of the board
+	:param colorDistribution: List with color distribution as described above
+	:param seed: Seed to initialize the pseudo random number generator to get reproducable boards
+	:returns: The generated board as a one-line string as described in the competition guidelines
+	'''
+
+	colorSum = sum(colorDistribution)
+	if seed is not None:
+		random.seed(seed)
+	coords = [(i, j) for i in range (cols) for j in range (rows)]
+	random.shuffle(coords)
+	board = [[0 for i in range (cols)] for j in range (rows)]
+	fields = cols * rows
+	for color, colorAmount in enumerate(colorDistribution, start = 1):
+		coloredFields = fields * colorAmount // colorSum
+		for (x, y) in coords[:coloredFields]:
+			board[y][x] = color
+		coords = coords[coloredFields:]
+	for color, (x, y) in enumerate(coords, start=1):
+		board[y][x] = color
+
+	oneLineBoard = '[[' + '],['.join([','.join([str(x) for x in a]) for a in board]) + ']]'
+
+	return oneLineBoard
+
+
+def generateCells(cols, rows, colorDistribution, seed=0, index=0):
+	'''
+	Generates board number `index` of the corpus `seed`. The colors are counted like in `randomBoard` and shuffled with an own `random.Random` that is seeded from `seed` and `index` only. So every board can be made again from (seed, index) without the boards before it, processes can make different parts of a corpus at the same time, and the global `random` module is not touched.
+
+	:param cols: The number of columns of the board
+	:param rows: The number of rows of the board
+	:param colorDistribution: List with color distribution (see `randomBoard`)
+	:param seed: The seed of the corpus
+	:param index: The number of the board in the corpus
+	:returns: The colors as bytearray in the order of the one-line format (`rows` lists of `cols` elements, like `randomBoard`)
+	'''
+
+	rng = random.Random(seed * 2**64 + index)
+	colorSum = sum(colorDistribution)
+	fields = cols * rows
+	cells = bytearray()
+	for color, colorAmount in enumerate(colorDistribution, start=1):
+		cells += bytes([color]) * (fields * colorAmount // colorSum)
+	cells += bytes(range(1, fields - len(cells) + 1))
+	rng.shuffle(cells)
+
+	return cells
+
+
+def generateBoard(cols, rows, colorDistribution, seed=0, index=0):
+	'''
+	Generates board number `index` of the corpus `seed` (see `generateCells`).
+
+	:param cols: The number of columns of the board
+	:param rows: The number of rows of the board
+	:param colorDistribution: List with color distribution (see `randomBoard`)
+	:param seed: The seed of the corpus
+	:param index: The number of the board in the corpus
+	:returns: The board as list of `rows` lists with `cols` elements, which all board classes accept
+	'''
+
+	cells = generateCells(cols, rows, colorDistribution, seed, index)
+
+	return [list(cells[y * cols:(y + 1) * cols]) for y in range(rows)]
+
+
+def generateChunk(task):
+	'''
+	Worker of `generateCorpus`. Generates consecutive boards of a corpus.
+
+	:param task: Tuple (cols, rows, color distribution, seed, index of the first board, number of boards)
+	:returns: List of the boards as bytes (see `generateCells`)
+	'''
+
+	cols, rows, colorDistribution, seed, start, count = task
+
+	return [bytes(generateCells(cols, rows, colorDistribution, seed, index)) for index in range(start, start + count)]
+
+
+def generateCorpus(count, cols, rows, colorDistribution, seed=0, start=0, workers=1, chunkSize=1000):
+	'''
+	Generates the boards `start` to `start + count - 1` of the corpus `seed` (see `generateCells`), optionally in a pool of processes. The boards are generated in chunks while they are consumed, only a few chunks per process ahead, so `count` may be larger than what fits into memory. The boards are the same for any number of processes.
+
+	:param count: The number of boards
+	:param cols: The number of columns of the boards
+	:param rows: The number of rows of the boards
+	:param colorDistribution: List with color distribution (see `randomBoard`)
+	:param seed: The seed of the corpus
+	:param start: The index of the first board
+	:param workers: Number of processes (None for one per CPU, 1 to generate in this process)
+	:param chunkSize: The number of boards a process generates at once
+	:returns: Generator of boards in the order of their index, as lists of `rows` columns (bytes with `cols` elements)
+	'''
+
+	if workers is None:
+		workers = os.cpu_count() or 1
+	tasks = ((cols, rows, colorDistribution, seed, i, min(chunkSize, start + count - i)) for i in range(start, start + count, chunkSize))
+
+	def split(chunk):
+		for cells in chunk:
+			yield [cells[y * cols:(y + 1) * cols] for y in range(rows)]
+
+	if workers == 1:
+		for task in tasks:
+			yield from split(generateChunk(task))
+		return
+
+	with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+		pending = collections.deque()
+		for task in tasks:
+			pending.append(pool.submit(generateChunk, task))
+			if len(pending) >= 2 * workers:
+				yield from split(pending.popleft().result())
+		for future in pending:
+			yield from split(future.result())
+
+
+engines = {'list': Board, 'unionfind': UnionFindBoard, 'bit': BitBoard, 'indexed': AreaIndexBoard}
+
+heuristics = {'final': evaluateFinalScore, 'areas': evaluateAreas}
+
+players = {'best': playShortsightedBestField, 'worst': playShortsightedWorstField, 'bfs': playGraphBasedBasic, 'bfsnodouble': playGraphBasedNoDoubleBoards, 'beam': playBeamSearch, 'nmcs': playNestedMonteCarlo, 'bfsparallel': playGraphBasedParallel, 'anytime': playAnytime, 'bfsdisk': playGraphBasedSpilling, 'bnb': playBranchAndBound}
+
+# The AIs that stop at a time limit (see `runPlayer`)
+timedPlayers = {'nmcs', 'anytime', 'bnb'}
+
+
+testgrid = '[[3,2,3,3,1,1,2,3,1,1,2,3],[3,2,2,1,1,3,3,3,1,2,2,1],[3,3,2,1,1,1,2,3,1,1,2,3],[3,2,2,1,1,2,3,3,2,3,2,2],[1,2,3,1,1,3,2,3,3,2,3,1],[2,3,1,1,2,1,1,3,1,2,3,1],[1,3,2,2,3,2,1,2,2,3,1,1]]'
+
+
+if __name__ == "__main__":
+
+	board = False
+
+	engine = popOption(sys.argv, '--engine', 'list')
+	if engine not in engines:
+		print('Unknown engine {}'.format(engine))
+		usage()
+		sys.exit(1)
+	BoardClass = engines[engine]
+
+	player = popOption(sys.argv, '--player', 'best')
+	if player not in players:
+		print('Unknown player {}'.format(player))
+		usage()
+		sys.exit(1)
+	width = int(popOption(sys.argv, '--width', 100))
+	level = int(popOption(sys.argv, '--level', 2))
+	iterations = popOption(sys.argv, '--iterations')
+	if iterations is not None:
+		iterations = int(iterations)
+	timeLimit = popOption(sys.argv, '--time-limit')
+	if timeLimit is not None:
+		timeLimit = float(timeLimit)
+	memoryLimit = int(float(popOption(sys.argv, '--memory', 64)) * 2**20)
+	heuristic = popOption(sys.argv, '--heuristic', 'final')
+	if heuristic not in heuristics:
+		print('Unknown heuristic {}'.format(heuristic))
+		usage()
+		sys.exit(1)
+	canonical = popFlag(sys.argv, '--canonical')
+	options = {'width': width, 'level': level, 'iterations': iterations, 'timeLimit': timeLimit, 'memoryLimit': memoryLimit, 'heuristic': heuristic, 'canonical': canonical}
+	workers = popOption(sys.argv, '--workers')
+	order = popOption(sys.argv, '--order', 'input')
+	port = int(popOption(sys.argv, '--port', 8080))
+	verbose = int(popOption(sys.argv, '--verbose', 0))
+	profile = popFlag(sys.argv, '--profile')
+	if order not in ('input', 'completion'):
+		print('Unknown order {}'.format(order))
+		usage()
+		sys.exit(1)
+
+	sizes = popOption(sys.argv, '--sizes')
+	colorCounts = [int(x) for x in popOption(sys.argv, '--colors', '3,5').split(',')]
+	repeat = int(popOption(sys.argv, '--repeat', 3))
+	maxPlayerSize = int(popOption(sys.argv, '--player-size', 50))
+	numOfBoards = int(popOption(sys.argv, '--boards', 5))
+	implementations = popOption(sys.argv, '--impl')
+	out = popOption(sys.argv, '--out')
+
+	if len(sys.argv) == 2 and sys.argv[1] in ('bench', 'check'):
+		targets = benchmarkTargets()
+		if implementations is not None:
+			targets = {name: t for name, t in targets.items() if name.startswith(tuple(implementations.split(',')))}
+
+	if len(sys.argv) == 2 and sys.argv[1] == 'bench':
+		sizes = [int(x) for x in (sizes or '10,25,50,100').split(',')]
+		writeBenchmark(benchmark(targets, sizes, colorCounts, repeat, maxPlayerSize=maxPlayerSize), out or 'bench.json')
+		sys.exit(0)
+
+	if len(sys.argv) == 2 and sys.argv[1] == 'check':
+		sizes = [int(x) for x in (sizes or '5,10,20').split(',')]
+		grids = [randomBoard(size, size, [1] * colors, i) for size in sizes for colors in colorCounts for i in range(numOfBoards)]
+		differences, timing = differentialTest(targets, grids)
+		for name, i, n, move, what in differences:
+			print('{}: board {} {}, after move {} {}: {} differ'.format(name, i, grids[i], n, move, ', '.join(what)))
+		print('{:<22} {:>8} {:>12} {:>12} {:>12}'.format('implementation', 'clicks', 'time [s]', 'clicks/sec', 'differences'))
+		for name, (clicks, seconds) in timing.items():
+			print('{:<22} {:>8} {:>12.4f} {:>12.1f} {:>12}'.format(name, clicks, seconds, clicks / seconds if seconds else 0, len([d for d in differences if d[0] == name])))
+		sys.exit(1 if differences else 0)
+
+	if len(sys.argv) == 2 and sys.argv[1] == 'serve':
+		SolveServer(player, engine, options, None if workers is None else int(workers), port).run()
+		sys.exit(0)
+
+	# Batch mode: `batch [oneline|grid|binary] [filename]`, reads from STDIN without a filename or with `-`
+	if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+		args = sys.argv[2:]
+		style = 'oneline'
+		if args and args[0] in ('oneline', 'grid', 'binary'):
+			style = args.pop(0)
+		if len(args) > 1 or (style == 'binary' and (not args or args[0] == '-')):
+			usage()
+			sys.exit(1)
+		if style == 'binary':
+			try:
+				boards = BoardFile(args[0])
+			except (OSError, ValueError) as e:
+				print(e)
+				usage()
+				sys.exit(1)
+			with boards:
+				solveBatch(boards, player, engine, options, None if workers is None else int(workers), order)
+		elif not args or args[0] == '-':
+			solveBatch(readBoards(sys.stdin, style), player, engine, options, None if workers is None else int(workers), order)
+		else:
+			try:
+				f = open(args[0], 'r')
+			except OSError:
+				print('Could not find file {}'.format(args[0]))
+				usage()
+				sys.exit(1)
+			with f:
+				solveBatch(readBoards(f, style), player, engine, options, None if workers is None else int(workers), order)
+		sys.exit(0)
+
+	# Generate a corpus of random boards: `generate [oneline|binary] cols rows colorDistribution count [seed]`
+	if len(sys.argv) > 1 and sys.argv[1] == 'generate':
+		args = sys.argv[2:]
+		style = 'oneline'
+		if args and args[0] in ('oneline', 'binary'):
+			style = args.pop(0)
+		if len(args) not in (4, 5) or (style == 'binary' and out is None):
+			usage()
+			sys.exit(1)
+		corpus = generateCorpus(int(args[3]), int(args[0]), int(args[1]), [int(x) for x in args[2].split(',')], int(args[4]) if len(args) == 5 else 0, workers=None if workers is None else int(workers))
+		if style == 'binary':
+			with open(out, 'wb') as f:
+				writeBoardFile(f, corpus)
+		else:
+			with (open(out, 'w') if out is not None else contextlib.nullcontext(sys.stdout)) as f:
+				for columns in corpus:
+					f.write('[[' + '],['.join([','.join(map(str, column)) for column in columns]) + ']]\n')
+		sys.exit(0)
+
+	# Pack boards into a binary file: `pack [oneline|grid] [filename|-] binaryfile`
+	if len(sys.argv) > 1 and sys.argv[1] == 'pack':
+		args = sys.argv[2:]
+		style = 'oneline'
+		if args and args[0] in ('oneline', 'grid'):
+			style = args.pop(0)
+		if len(args) not in (1, 2):
+			usage()
+			sys.exit(1)
+		with open(args[-1], 'wb') as out:
+			if len(args) == 1 or args[0] == '-':
+				count = writeBoardFile(out, readBoards(sys.stdin, style))
+			else:
+				try:
+					f = open(args[0], 'r')
+				except OSError:
+					print('Could not find file {}'.format(args[0]))
+					usage()
+					sys.exit(1)
+				with f:
+					count = writeBoardFile(out, readBoards(f, style))
+		print('{} boards written to {}'.format(count, args[-1]))
+		sys.exit(0)
+
+	# If no argument is given, ask for the field via STDIN.
+	# If one argument is given and it is `-h`, print usage, if the argument is `test`, use the testboard. In any other case, assume that the argument is the board.
+	# If two arguments are given assume that the second argument is a filename with the grid. The style of the grid in the file depends on the first argument (`oneline`: as usual; `grid`: in tsv format). If the keyword is missing, or the file does not exist, print usage.
+	# If three or four arguments are given, generate a random board with the first arg as width, second as height and third as color distribution. The optional fourth argument serves as seed for the pseudo-random number generator
+
+	if len(sys.argv) == 1:
+		board = BoardClass(input('Enter the field in one line: '))
+	elif len(sys.argv) == 2:
+		if sys.argv[1] == 'test':
+			board = BoardClass(testgrid)
+		elif sys.argv[1] == '-h':
+			usage()
+		else:
+			board = BoardClass(sys.argv[1])
+	elif len(sys.argv) == 3:
+		try:
+			if sys.argv[1] == 'binary':
+				with BoardFile(sys.argv[2]) as boards:
+					board = BoardClass(boards[0])
+			else:
+				with open(sys.argv[2], 'r') as f:
+					if sys.argv[1] == 'oneline':
+						board = BoardClass(f.read().rstrip())
+					elif sys.argv[1] == 'grid':
+						board = BoardClass(f.read())
+					else:
+						usage()
+		except OSError:
+			print('Could not find file {}'.format(sys.argv[2]))
+			usage()
+		except (ValueError, IndexError) as e:
+			print(e)
+			usage()
+	elif len(sys.argv) == 4:
+		board = BoardClass(randomBoard(int(sys.argv[1]), int(sys.argv[2]), [int(x) for x in sys.argv[3].split(',')]))
+	elif len(sys.argv) == 5:
+		board = BoardClass(randomBoard(int(sys.argv[1]), int(sys.argv[2]), [int(x) for x in sys.argv[3].split(',')], int(sys.argv[4])))
+	else:
+		usage()
+
+	#if board:
+	#	runSequence(board, [(1, 1), (2, 2), (2, 2), (4, 0), (5, 3), (5, 3), (4, 0), (4, 0), (4, 0)])
+
+	#quit()
+
+	if board:
+		trace = Trace(verbose)
+		if profile:
+			profiler = Profiler()
+			profiler.enable()
+			cProfiler = cProfile.Profile()
+			cProfiler.enable()
+		now = time.perf_counter()
+		if player == 'bfsparallel':
+			result = playGraphBasedParallel(board, None if workers is None else int(workers), trace)
+		elif workers is not None:
+			result = playRootParallel(board, player, int(workers), engine, options, trace)
+		else:
+			result = runPlayer(player, board, options, trace)
+		elapsed = time.perf_counter()-now
+		if profile:
+			cProfiler.disable()
+			profiler.disable()
+		# The shortsighted AIs write their frames while playing, the others only know the moves at the end
+		if verbose >= 2 and not isinstance(result, str):
+			runSequence(board, result, trace)
+		trace.flush()
+		print(result, file=sys.stderr)
+		if profile:
+			# Only this process is measured, not the workers of `--workers` and `bfsparallel`
+			pstats.Stats(cProfiler, stream=sys.stderr).sort_stats('cumulative').print_stats(25)
+			profiler.report()
+		print(elapsed)
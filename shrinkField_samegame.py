@@ -23,7 +23,8 @@ def printBoard(board):
 	Prints the board in a nice way.
 	'''
 
-	heights = []
+	# a cleared board has no columns left
+	heights = [0]
 	for x in range(len(board['b'])):
 		heights.append(len(board['b'][x]))
 
@@ -159,7 +160,7 @@ def calcRemainingPoints(b):
 			if b[x][y]:
 				if b[x][y] not in colors:
 					colors[b[x][y]] = 0
-				colors[b[x][y]] += 0
+				colors[b[x][y]] += 1
 
 	for c in colors:
 		score += calcScore(colors[c])
@@ -460,6 +461,6 @@ if __name__ == "__main__":
 	#quit()
 
 	if board:
-		now = time.clock()
+		now = time.perf_counter()
 		print(playGraphBasedNoDoubleBoards(board), file=sys.stderr)
-		print(time.clock()-now)
+		print(time.perf_counter()-now)